@@ -2,7 +2,7 @@ import os
 import enum
 import json
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, JSON, DateTime, Boolean, Text, Enum
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, JSON, DateTime, Boolean, Text, Enum, LargeBinary, Index
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
 # Setup
@@ -10,6 +10,9 @@ Base = declarative_base()
 DATABASE_URL = "sqlite:///anohub_core_enhanced.db"
 engine = create_engine(DATABASE_URL)
 
+# Width of one columnar telemetry chunk (see SensorChunk / telemetry_store.py)
+CHUNK_BUCKET_SECONDS = 3600
+
 # ==========================================
 # ENUMS & CONSTANTS
 # ==========================================
@@ -90,6 +93,10 @@ class MechanicalComponent(Base):
 # ==========================================
 class SensorLog(Base):
     __tablename__ = 'realtime_sensor_logs'
+    __table_args__ = (
+        # "Last N minutes for turbine X" / per-turbine range scans (see telemetry_queries.py)
+        Index('ix_realtime_sensor_logs_turbine_ts', 'turbine_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     turbine_id = Column(Integer, ForeignKey('turbines.id'))
@@ -104,6 +111,22 @@ class SensorLog(Base):
     
     turbine = relationship("Turbine", back_populates="sensors")
 
+class SensorChunk(Base):
+    """Optional columnar copy of SensorLog: one row per (turbine, time bucket)."""
+    __tablename__ = 'sensor_chunks'
+
+    turbine_id = Column(Integer, ForeignKey('turbines.id'), primary_key=True)
+    bucket_start = Column(Integer, primary_key=True) # Epoch seconds, aligned to CHUNK_BUCKET_SECONDS
+    sample_count = Column(Integer, nullable=False)
+
+    # Compressed arrays (see telemetry_store.py for the encoding)
+    timestamps_us = Column(LargeBinary, nullable=False) # delta-encoded int64 epoch microseconds
+    vibration_x_mm_s = Column(LargeBinary)
+    vibration_y_mm_s = Column(LargeBinary)
+    bearing_temp_c = Column(LargeBinary)
+    oil_pressure_bar = Column(LargeBinary)
+    active_power_mw = Column(LargeBinary)
+
 class LegacyIncident(Base):
     __tablename__ = 'legacy_incidents'
     
@@ -1,4 +1,74 @@
-import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+# Offer status codes used by the batch APIs; index = code
+STATUS_CODES = ("SHORTLIST", "NEGOTIATE", "REJECT")
+STATUS_SHORTLIST, STATUS_NEGOTIATE, STATUS_REJECT = 0, 1, 2
+
+RHO_G_KW = 9.81  # rho * g / 1000: hydraulic power in kW = RHO_G_KW * Q * H
+
+# Typical application envelopes for the European specific speed n_q = n * sqrt(Q) / H^(3/4)
+NQ_ENVELOPES = {
+    'pelton': (2.0, 35.0),    # up to 6 jets
+    'francis': (15.0, 120.0),
+    'kaplan': (90.0, 300.0),
+}
+
+# Required plant sigma from specific speed, sigma = a * N_s^b (USBR empirical fit, N_s in m-kW units)
+THOMA_COEFFS = {
+    'francis': (7.54e-5, 1.41),
+    'kaplan': (6.40e-5, 1.46),
+}
+VAPOUR_HEAD_M = 0.24  # water at ~20 C
+
+
+def _columns(table, names) -> dict:
+    """Accepts a list of row dicts or a dict of columns; returns {name: list}."""
+    if isinstance(table, dict):
+        return {n: list(table[n]) for n in names if n in table}
+    return {n: [row.get(n) for row in table] for n in names if any(n in row for row in table)}
+
+
+def _offer_columns(offers, names) -> dict:
+    """
+    _columns for offers. offered_efficiency is mandatory: the NaN-skips-the-check
+    rule only applies to the optional physics columns, so a missing efficiency
+    raises instead of silently passing every check.
+    """
+    cols = _columns(offers, names)
+    n_offers = len(cols.get("turbine_type", ()))
+    eff = cols.get("offered_efficiency", [None] * n_offers)
+    missing = [i for i, v in enumerate(eff) if v is None or not np.isfinite(float(v))]
+    if missing:
+        raise ValueError(f"offered_efficiency missing or not finite for offer index(es) {missing[:10]}")
+    return cols
+
+
+def site_invariants(net_head_m, design_flow_cms, elevation_masl=0.0) -> dict:
+    """
+    Per-site quantities reused by every offer check. Works on scalars or
+    arrays (the portfolio mode passes (S, 1) columns).
+    """
+    hn = np.asarray(net_head_m, dtype=float)
+    q = np.asarray(design_flow_cms, dtype=float)
+    hydraulic_power_kw = RHO_G_KW * q * hn
+    # P = rho * g * Q * H * eta_approx (assuming 90% for rough calc)
+    approx_power_kw = hydraulic_power_kw * 0.90
+    # Barometric head in metres of water column at the tailwater elevation
+    atm_head_m = 10.33 * (1 - 2.26e-5 * np.asarray(elevation_masl, dtype=float)) ** 5.256
+    return {
+        "hydraulic_power_kw": hydraulic_power_kw,
+        "approx_power_kw": approx_power_kw,
+        "sqrt_q": np.sqrt(q),
+        "sqrt_p": np.sqrt(approx_power_kw),
+        "h_34": hn ** 0.75,
+        "h_54": hn ** 1.25,
+        # sigma_plant = (H_atm - H_vap - H_s) / H = sigma_base - H_s / H
+        "sigma_base": (atm_head_m - VAPOUR_HEAD_M) / hn,
+    }
+
 
 class BidEvaluator:
     """
@@ -13,20 +83,94 @@ class BidEvaluator:
         'pelton': 92.5
     }
 
-    def __init__(self, net_head_m: float, design_flow_cms: float):
+    def __init__(self, net_head_m: float, design_flow_cms: float, elevation_masl: float = 0.0):
         """
         Initialize with site-specific partials.
         :param net_head_m: Net Head (Hn) in meters
         :param design_flow_cms: Design Flow (Q) in cubic meters per second
+        :param elevation_masl: Tailwater elevation, used for the atmospheric head in the Thoma check
         """
         self.hn = net_head_m
         self.q = design_flow_cms
-        # P = rho * g * Q * H * eta_approx (assuming 90% for rough calc)
-        self.approx_power_kw = 1000 * 9.81 * self.q * self.hn * 0.90
+        self.elevation_masl = elevation_masl
+        # Site invariants (H^(3/4), H^(5/4), sqrt(Q), sqrt(P), sigma base) are computed once here
+        self._inv = {k: float(v) for k, v in site_invariants(net_head_m, design_flow_cms, elevation_masl).items()}
+        self.hydraulic_power_kw = self._inv["hydraulic_power_kw"]
+        self.approx_power_kw = self._inv["approx_power_kw"]
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def for_site(cls, net_head_m: float, design_flow_cms: float, elevation_masl: float = 0.0) -> "BidEvaluator":
+        """Shared evaluator per site, so repeated scoring against a site reuses its invariants."""
+        return cls(net_head_m, design_flow_cms, elevation_masl)
+
+    # ------------------------------------------------------------------
+    # Individual checks: (score penalty, warning text or None)
+    # ------------------------------------------------------------------
+    @classmethod
+    def _efficiency_check(cls, turbine_type: str, offered_efficiency: float):
+        limit = cls.THEORETICAL_LIMITS.get(turbine_type, 90.0)
+        if offered_efficiency > limit:
+            return 50, f"CRITICAL: Claimed efficiency {offered_efficiency}% exceeds theoretical physical limit for {turbine_type} ({limit}%). Marketing exaggeration likely."
+        if offered_efficiency > limit - 1.0:
+            return 20, f"WARNING: Claimed efficiency {offered_efficiency}% is extremely close to theoretical limit. Verify IEC 60041 model test."
+        return 0, None
 
-    def evaluate_offer(self, manufacturer: str, turbine_type: str, offered_efficiency: float, price_eur: float):
+    @staticmethod
+    def _application_check(net_head_m: float, turbine_type: str):
+        if turbine_type == 'kaplan' and net_head_m > 80:
+            return 30, f"RISK: Kaplan turbine at {net_head_m}m head has extreme cavitation risk. Suggest Francis."
+        if turbine_type == 'francis' and net_head_m < 20:
+            return 15, f"ECONOMIC: Francis at {net_head_m}m might be too expensive due to spiral case size. Suggest Kaplan/Bulb."
+        return 0, None
+
+    @staticmethod
+    def _specific_speed_check(turbine_type: str, nq: float, ns: float):
+        envelope = NQ_ENVELOPES.get(turbine_type)
+        if envelope is None:
+            return 0, None
+        lo, hi = envelope
+        if nq < lo or nq > hi:
+            return 25, f"SHAPE: Specific speed n_q={nq:.1f} (N_s={ns:.0f}) is outside the {turbine_type} envelope ({lo:g}-{hi:g}). Runner type does not suit this head/flow/speed."
+        return 0, None
+
+    @staticmethod
+    def _cavitation_check(turbine_type: str, sigma_plant: float, ns: float):
+        coeffs = THOMA_COEFFS.get(turbine_type)
+        if coeffs is None:
+            return 0, None
+        sigma_required = coeffs[0] * ns ** coeffs[1]
+        if sigma_plant < sigma_required:
+            return 30, f"CAVITATION: Plant Thoma sigma {sigma_plant:.3f} is below the required {sigma_required:.3f} at N_s={ns:.0f}. Runner must be set deeper."
+        if sigma_plant < 1.1 * sigma_required:
+            return 10, f"WARNING: Thoma sigma margin is only {sigma_plant / sigma_required - 1:.0%} (plant {sigma_plant:.3f} vs required {sigma_required:.3f}). Request model cavitation test."
+        return 0, None
+
+    @staticmethod
+    def _power_check(rated_power_kw: float, available_kw: float, approx_power_kw: float, offered_efficiency: float):
+        if rated_power_kw > available_kw * 1.01:
+            return 40, f"CRITICAL: Rated power {rated_power_kw:.0f} kW exceeds the {available_kw:.0f} kW hydraulically available at {offered_efficiency}% efficiency."
+        if rated_power_kw < 0.6 * approx_power_kw:
+            return 10, f"ECONOMIC: Rated power {rated_power_kw:.0f} kW uses only {rated_power_kw / approx_power_kw:.0%} of the site's ~{approx_power_kw:.0f} kW. Unit looks undersized."
+        return 0, None
+
+    @staticmethod
+    def _status_for(score):
+        if score > 80:
+            return "SHORTLIST"
+        elif score > 50:
+            return "NEGOTIATE"
+        return "REJECT"
+
+    def evaluate_offer(self, manufacturer: str, turbine_type: str, offered_efficiency: float, price_eur: float,
+                       rated_speed_rpm: float = None, rated_power_kw: float = None, setting_height_m: float = None):
         """
         Evaluates a single bid.
+
+        The optional machine data enables the remaining physics checks:
+        :param rated_speed_rpm: Synchronous speed n -> specific speed envelope (+ cavitation with setting_height_m)
+        :param rated_power_kw: Rated turbine output -> power plausibility
+        :param setting_height_m: Runner centreline above tailwater (H_s, negative = submerged)
         """
         turbine_type = turbine_type.lower()
         report = {
@@ -35,38 +179,260 @@ class BidEvaluator:
             "warnings": [],
             "score": 100
         }
+        inv = self._inv
+        checks = [
+            # 1. PHYSICS CHECK: Efficiency
+            self._efficiency_check(turbine_type, offered_efficiency),
+            # 2. APPLICATION MATRIX CHECK (Head vs Type)
+            self._application_check(self.hn, turbine_type),
+        ]
+        metrics = {}
 
-        # 1. PHYSICS CHECK: Efficiency
-        limit = self.THEORETICAL_LIMITS.get(turbine_type, 90.0)
-        if offered_efficiency > limit:
-            report["warnings"].append(f"CRITICAL: Claimed efficiency {offered_efficiency}% exceeds theoretical physical limit for {turbine_type} ({limit}%). Marketing exaggeration likely.")
-            report["score"] -= 50
-        elif offered_efficiency > limit - 1.0:
-             report["warnings"].append(f"WARNING: Claimed efficiency {offered_efficiency}% is extremely close to theoretical limit. Verify IEC 60041 model test.")
-             report["score"] -= 20
-
-        # 2. APPLICATION MATRIX CHECK (Head vs Type)
-        if turbine_type == 'kaplan' and self.hn > 80:
-            report["warnings"].append(f"RISK: Kaplan turbine at {self.hn}m head has extreme cavitation risk. Suggest Francis.")
-            report["score"] -= 30
-        elif turbine_type == 'francis' and self.hn < 20:
-             report["warnings"].append(f"ECONOMIC: Francis at {self.hn}m might be too expensive due to spiral case size. Suggest Kaplan/Bulb.")
-             report["score"] -= 15
-
-        # 3. SPECIFIC SPEED CHECK (N_s approximation)
-        # Ns = n * sqrt(P) / H^(5/4) -> roughly checks if the machine shape makes sense
-        # Skipped for brevity, but would be Step 3.
+        # 3. SPECIFIC SPEED CHECK: n_q = n*sqrt(Q)/H^(3/4), N_s = n*sqrt(P)/H^(5/4)
+        if rated_speed_rpm is not None:
+            nq = rated_speed_rpm * inv["sqrt_q"] / inv["h_34"]
+            ns = rated_speed_rpm * inv["sqrt_p"] / inv["h_54"]
+            metrics.update(nq=round(nq, 2), ns=round(ns, 1))
+            checks.append(self._specific_speed_check(turbine_type, nq, ns))
+
+            # 4. CAVITATION CHECK (Thoma sigma, reaction turbines only)
+            if setting_height_m is not None:
+                sigma_plant = inv["sigma_base"] - setting_height_m / self.hn
+                metrics["sigma_plant"] = round(sigma_plant, 4)
+                checks.append(self._cavitation_check(turbine_type, sigma_plant, ns))
+
+        # 5. POWER PLAUSIBILITY
+        if rated_power_kw is not None:
+            available_kw = inv["hydraulic_power_kw"] * offered_efficiency / 100
+            checks.append(self._power_check(rated_power_kw, available_kw, inv["approx_power_kw"], offered_efficiency))
+
+        for penalty, warning in checks:
+            if warning:
+                report["warnings"].append(warning)
+            report["score"] -= penalty
+        if metrics:
+            report["metrics"] = metrics
 
         # FINAL VERDICT
-        if report["score"] > 80:
-            report["status"] = "SHORTLIST"
-        elif report["score"] > 50:
-            report["status"] = "NEGOTIATE"
-        else:
-            report["status"] = "REJECT"
+        report["status"] = self._status_for(report["score"])
 
         return report
 
+    # ------------------------------------------------------------------
+    # Batch modes
+    # ------------------------------------------------------------------
+    OFFER_COLUMNS = ("manufacturer", "turbine_type", "offered_efficiency", "price_eur",
+                     "rated_speed_rpm", "rated_power_kw", "setting_height_m")
+
+    @classmethod
+    def _score_batch(cls, heads, inv: dict, offer_cols: dict, efficiency=None) -> dict:
+        """
+        Vectorized scoring core. `heads` and every `inv` entry are (S, 1)
+        columns; offer columns become (1, O) rows. Missing optional offer data
+        (speed, rated power, setting height) is NaN and simply skips the
+        corresponding check; offered_efficiency is validated up front by
+        _offer_columns. `efficiency` may override the offered efficiencies
+        with an (S, O) matrix (Monte Carlo mode).
+        """
+        n_offers = len(offer_cols["turbine_type"])
+
+        def row(name):
+            values = offer_cols.get(name) or [None] * n_offers
+            return np.array([np.nan if v is None else v for v in values], dtype=float)[None, :]
+
+        hn = np.asarray(heads, dtype=float)
+        types = [t.lower() for t in offer_cols["turbine_type"]]
+        eff = row("offered_efficiency") if efficiency is None else np.asarray(efficiency, dtype=float)
+        n = row("rated_speed_rpm")
+        rated = row("rated_power_kw")
+        setting = row("setting_height_m")
+
+        limit = np.array([cls.THEORETICAL_LIMITS.get(t, 90.0) for t in types])[None, :]
+        is_kaplan = np.array([t == 'kaplan' for t in types])[None, :]
+        is_francis = np.array([t == 'francis' for t in types])[None, :]
+        nq_lo = np.array([NQ_ENVELOPES.get(t, (-np.inf, np.inf))[0] for t in types])[None, :]
+        nq_hi = np.array([NQ_ENVELOPES.get(t, (-np.inf, np.inf))[1] for t in types])[None, :]
+        thoma_a = np.array([THOMA_COEFFS.get(t, (np.nan, np.nan))[0] for t in types])[None, :]
+        thoma_b = np.array([THOMA_COEFFS.get(t, (np.nan, np.nan))[1] for t in types])[None, :]
+
+        # A handful of arithmetic operations per (site, offer) pair; comparisons with NaN are False
+        nq = n * inv["sqrt_q"] / inv["h_34"]
+        ns = n * inv["sqrt_p"] / inv["h_54"]
+        sigma_plant = inv["sigma_base"] - setting / hn
+        sigma_required = thoma_a * ns ** thoma_b
+        available_kw = inv["hydraulic_power_kw"] * eff / 100
+
+        score = (
+            100
+            - np.where(eff > limit, 50, np.where(eff > limit - 1.0, 20, 0))
+            - np.where(is_kaplan & (hn > 80), 30, np.where(is_francis & (hn < 20), 15, 0))
+            - np.where((nq < nq_lo) | (nq > nq_hi), 25, 0)
+            - np.where(sigma_plant < sigma_required, 30, np.where(sigma_plant < 1.1 * sigma_required, 10, 0))
+            - np.where(rated > available_kw * 1.01, 40, np.where(rated < 0.6 * inv["approx_power_kw"], 10, 0))
+        )
+        status = np.full(score.shape, STATUS_REJECT, dtype=np.uint8)
+        status[score > 50] = STATUS_NEGOTIATE
+        status[score > 80] = STATUS_SHORTLIST
+        return {"score": score, "status": status, "types": types}
+
+    @classmethod
+    def _reports(cls, scored: dict, site_labels, evaluators, offer_cols: dict) -> list:
+        """Builds evaluate_offer-style reports, only for pairs that were not rejected."""
+        reports = []
+        status, score = scored["status"], scored["score"]
+        for s_idx, o_idx in zip(*np.nonzero(status != STATUS_REJECT)):
+            s_idx, o_idx = int(s_idx), int(o_idx)
+            offer = {name: offer_cols[name][o_idx] for name in cls.OFFER_COLUMNS if name in offer_cols}
+            text = evaluators[s_idx].evaluate_offer(
+                offer.get("manufacturer"), scored["types"][o_idx], offer["offered_efficiency"], offer.get("price_eur"),
+                offer.get("rated_speed_rpm"), offer.get("rated_power_kw"), offer.get("setting_height_m"),
+            )
+            text.update({
+                "site": site_labels[s_idx] if site_labels else s_idx,
+                "site_index": s_idx,
+                "offer_index": o_idx,
+                "status": STATUS_CODES[status[s_idx, o_idx]],
+                "score": int(score[s_idx, o_idx]),
+            })
+            reports.append(text)
+        return reports
+
+    def evaluate_offers(self, offers, with_reports: bool = True) -> dict:
+        """
+        Scores many offers against this site using the cached site invariants.
+
+        :param offers: Rows or columns with OFFER_COLUMNS (optional ones may be omitted)
+        :return: {"score": (O,), "status": (O,) STATUS_CODES indices, "reports": [...] for non-rejected offers}
+        """
+        offer_cols = _offer_columns(offers, self.OFFER_COLUMNS)
+        inv = {k: np.array([[v]]) for k, v in self._inv.items()}
+        scored = self._score_batch([[self.hn]], inv, offer_cols)
+        reports = self._reports(scored, None, [self], offer_cols) if with_reports else []
+        return {"score": scored["score"][0], "status": scored["status"][0], "reports": reports}
+
+    @classmethod
+    def evaluate_portfolio(cls, sites, offers) -> dict:
+        """
+        Scores a cross-product of sites x offers in vectorized form.
+
+        :param sites: Rows or columns with net_head_m, design_flow_cms (optional: elevation_masl, site_id)
+        :param offers: Rows or columns with OFFER_COLUMNS (optional ones may be omitted)
+        :return: {
+            "score": (S, O) int array,
+            "status": (S, O) uint8 array of STATUS_CODES indices,
+            "reports": evaluate_offer-style dicts (plus site/offer indices) for non-rejected pairs only
+        }
+        """
+        site_cols = _columns(sites, ("net_head_m", "design_flow_cms", "elevation_masl", "site_id"))
+        offer_cols = _offer_columns(offers, cls.OFFER_COLUMNS)
+        heads = site_cols["net_head_m"]
+        flows = site_cols["design_flow_cms"]
+        elevations = [e or 0.0 for e in site_cols.get("elevation_masl", [0.0] * len(heads))]
+
+        inv = site_invariants(np.array(heads, dtype=float)[:, None], np.array(flows, dtype=float)[:, None],
+                              np.array(elevations, dtype=float)[:, None])
+        scored = cls._score_batch(np.array(heads, dtype=float)[:, None], inv, offer_cols)
+
+        evaluators = [cls.for_site(h, q, e) for h, q, e in zip(heads, flows, elevations)]
+        reports = cls._reports(scored, site_cols.get("site_id"), evaluators, offer_cols)
+        return {"score": scored["score"], "status": scored["status"], "reports": reports}
+
+    # ------------------------------------------------------------------
+    # Monte Carlo ranking stability
+    # ------------------------------------------------------------------
+    def monte_carlo_ranking(self, offers, flow_duration_curve=None, n_samples: int = 20000,
+                            head_tolerance: float = 0.05, efficiency_tolerance: float = 0.5,
+                            seed: int = 0, workers: int = None, chunks: int = 16) -> dict:
+        """
+        Re-scores all offers under uncertain head, flow and efficiency and
+        reports how stable the ranking is.
+
+        Each sample draws the design flow from the flow duration curve (inverse
+        CDF over exceedance probability), the net head from +/- head_tolerance
+        (fraction) and every offer's efficiency from +/- efficiency_tolerance
+        (percentage points). Offers are ranked by score, then by price.
+
+        The sample budget is split into a fixed number of chunks, each with its
+        own SeedSequence child, so the result depends on `seed` only and not on
+        the number of worker processes.
+
+        :param offers: Rows or columns with OFFER_COLUMNS
+        :param flow_duration_curve: HydrologyData.flow_duration_curve, [{"prob": %, "flow": m3/s}, ...];
+                                    None keeps the design flow fixed
+        :param workers: Process count (1 = run in this process, None = CPU count)
+        :return: {"n_samples", "manufacturers", "p_top1": (O,), "mean_rank": (O,), "std_rank": (O,),
+                  "rank_frequency": (O, O) share of samples with offer i at rank j (0 = best)}
+        """
+        offer_cols = _offer_columns(offers, self.OFFER_COLUMNS)
+        n_offers = len(offer_cols["turbine_type"])
+        if flow_duration_curve:
+            curve = sorted(flow_duration_curve, key=lambda p: p["prob"])
+            fdc = (tuple(float(p["prob"]) for p in curve), tuple(float(p["flow"]) for p in curve))
+        else:
+            fdc = None
+
+        children = np.random.SeedSequence(seed).spawn(chunks)
+        sizes = [n_samples // chunks + (1 if i < n_samples % chunks else 0) for i in range(chunks)]
+        site = (self.hn, self.q, self.elevation_masl)
+        jobs = [(site, fdc, offer_cols, size, child, head_tolerance, efficiency_tolerance)
+                for size, child in zip(sizes, children) if size]
+
+        if workers == 1:
+            parts = [_monte_carlo_chunk(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_monte_carlo_chunk, jobs))
+
+        counts = sum(p[0] for p in parts)
+        rank_sum = sum(p[1] for p in parts)
+        rank_sq_sum = sum(p[2] for p in parts)
+        mean_rank = rank_sum / n_samples
+        return {
+            "n_samples": n_samples,
+            "manufacturers": offer_cols.get("manufacturer", list(range(n_offers))),
+            "p_top1": counts[:, 0] / n_samples,
+            "mean_rank": mean_rank,
+            "std_rank": np.sqrt(np.maximum(rank_sq_sum / n_samples - mean_rank ** 2, 0.0)),
+            "rank_frequency": counts / n_samples,
+        }
+
+
+def _sample_flows(fdc, design_flow_cms: float, rng, size: int) -> np.ndarray:
+    """Inverse CDF of the flow duration curve: uniform exceedance probability -> flow."""
+    if fdc is None:
+        return np.full(size, float(design_flow_cms))
+    probs, flows = fdc
+    return np.interp(rng.uniform(0.0, 100.0, size), probs, flows)
+
+
+def _monte_carlo_chunk(job):
+    """
+    Worker: scores one chunk of samples (samples play the role of portfolio
+    sites) and returns (rank counts (O, O), rank sum (O,), rank square sum (O,)).
+    """
+    (hn, q, elevation), fdc, offer_cols, size, seed_seq, head_tol, eff_tol = job
+    rng = np.random.default_rng(seed_seq)
+    n_offers = len(offer_cols["turbine_type"])
+
+    heads = hn * (1 + rng.uniform(-head_tol, head_tol, size))
+    flows = _sample_flows(fdc, q, rng, size)
+    offered = np.asarray(offer_cols["offered_efficiency"], dtype=float)
+    eff = offered[None, :] + rng.uniform(-eff_tol, eff_tol, (size, n_offers))
+
+    inv = site_invariants(heads[:, None], flows[:, None], elevation)
+    score = BidEvaluator._score_batch(heads[:, None], inv, offer_cols, efficiency=eff)["score"]
+
+    # Rank by score (desc), ties broken by price (asc)
+    price = np.array([np.inf if p is None else p for p in offer_cols.get("price_eur") or [None] * n_offers], dtype=float)
+    order = np.lexsort((np.broadcast_to(price, score.shape), -score), axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(n_offers)[None, :], axis=1)
+
+    counts = np.zeros((n_offers, n_offers), dtype=np.int64)
+    np.add.at(counts, (np.broadcast_to(np.arange(n_offers), ranks.shape), ranks), 1)
+    return counts, ranks.sum(axis=0), (ranks.astype(np.int64) ** 2).sum(axis=0)
+
+
 # --- USAGE EXAMPLE ---
 if __name__ == "__main__":
     # Site: 45m Head, 12 m3/s Flow
@@ -79,3 +445,39 @@ if __name__ == "__main__":
     # Bid 2: Marketing Lie
     bid2 = site_eval.evaluate_offer("SketchyTurbines Inc.", "francis", 98.0, 1200000)
     print(f"Bid 2: {bid2}")
+
+    # Bid 3: Full physics data (speed, rating, setting) -> n_q envelope, Thoma sigma, power plausibility
+    bid3 = site_eval.evaluate_offer("HydroTech Austria", "francis", 94.5, 1500000,
+                                    rated_speed_rpm=375, rated_power_kw=4900, setting_height_m=2.5)
+    print(f"Bid 3: {bid3}")
+
+    # Portfolio: 3 candidate sites x 4 offers in one call
+    sites = [
+        {"site_id": "Lower Weir", "net_head_m": 15, "design_flow_cms": 40},
+        {"site_id": "Mid Gorge", "net_head_m": 45, "design_flow_cms": 12},
+        {"site_id": "Alpine Intake", "net_head_m": 320, "design_flow_cms": 3},
+    ]
+    offers = [
+        {"manufacturer": "HydroTech Austria", "turbine_type": "francis", "offered_efficiency": 94.5, "price_eur": 1500000},
+        {"manufacturer": "SketchyTurbines Inc.", "turbine_type": "francis", "offered_efficiency": 98.0, "price_eur": 1200000},
+        {"manufacturer": "Nordic Bulb AB", "turbine_type": "kaplan", "offered_efficiency": 93.0, "price_eur": 1700000},
+        {"manufacturer": "Alpen Pelton GmbH", "turbine_type": "pelton", "offered_efficiency": 91.0, "price_eur": 900000,
+         "rated_speed_rpm": 750},
+    ]
+    portfolio = BidEvaluator.evaluate_portfolio(sites, offers)
+    print("\nPortfolio scores (rows = sites, cols = offers):")
+    print(portfolio["score"])
+    for r in portfolio["reports"]:
+        print(f"  {r['site']:<14} {r['manufacturer']:<20} {r['status']:<10} {r['score']}")
+
+    # Monte Carlo: how stable is the Mid Gorge ranking under hydrology / guarantee uncertainty?
+    fdc = [{"prob": 5, "flow": 24.0}, {"prob": 20, "flow": 16.0}, {"prob": 50, "flow": 11.0},
+           {"prob": 80, "flow": 6.5}, {"prob": 95, "flow": 3.0}]
+    mc_offers = offers + [
+        {"manufacturer": "Danube Hydro", "turbine_type": "francis", "offered_efficiency": 95.7, "price_eur": 1400000,
+         "rated_speed_rpm": 300, "rated_power_kw": 4500, "setting_height_m": 1.0},
+    ]
+    mc = BidEvaluator.for_site(45, 12).monte_carlo_ranking(mc_offers, fdc, n_samples=20000, seed=42)
+    print(f"\nMonte Carlo ranking stability ({mc['n_samples']} samples):")
+    for i, name in enumerate(mc["manufacturers"]):
+        print(f"  {name:<20} P(top1)={mc['p_top1'][i]:6.1%}  rank {mc['mean_rank'][i] + 1:.2f} +/- {mc['std_rank'][i]:.2f}")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+bid_pipeline.py
+
+Batch evaluation of stored bids (db_init.BidEvaluation) with BidEvaluator.
+
+Site data (Plant + HydrologyData) is loaded once per plant, bids are read in
+keyset-paginated batches (id > last_id, no OFFSET rescans) and scored with
+the vectorized BidEvaluator.evaluate_offers. Status and score are written back
+with one executemany UPDATE per batch.
+
+Usage:
+    python scripts/bid_pipeline.py                       # all PENDING bids of every plant
+    python scripts/bid_pipeline.py --plant 3 --rescore-all
+    python scripts/bid_pipeline.py --benchmark 100000    # synthetic DB, timed
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, create_engine, inspect, select, text, update
+from sqlalchemy.engine import Engine
+
+from bid_evaluator import STATUS_CODES, BidEvaluator
+from db_init import Base, BidEvaluation, DATABASE_URL, HydrologyData, Plant
+from telemetry_ingest import tune_sqlite
+
+# BidEvaluator verdicts -> bid_evaluations.status values
+DB_STATUS = {"SHORTLIST": "SHORTLIST", "NEGOTIATE": "NEGOTIATE", "REJECT": "REJECTED"}
+PENDING = "PENDING"
+
+
+# ==========================================
+# 1. SCHEMA
+# ==========================================
+def ensure_schema(bind: Engine) -> None:
+    """Creates missing tables, adds the score column to older databases and creates missing indexes."""
+    Base.metadata.create_all(bind, checkfirst=True)
+    table = BidEvaluation.__table__
+    columns = {c["name"] for c in inspect(bind).get_columns(table.name)}
+    if "score" not in columns:
+        with bind.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN score FLOAT"))
+    for index in table.indexes:
+        index.create(bind, checkfirst=True)
+
+
+# ==========================================
+# 2. PIPELINE
+# ==========================================
+def _site_evaluator(conn, plant_id: int) -> Optional[BidEvaluator]:
+    p, h = Plant.__table__, HydrologyData.__table__
+    row = conn.execute(
+        select(h.c.net_head_m, h.c.installed_flow_cms, p.c.elevation_masl)
+        .select_from(p.join(h, h.c.plant_id == p.c.id))
+        .where(p.c.id == plant_id)
+    ).first()
+    if row is None or row.net_head_m is None or row.installed_flow_cms is None:
+        return None
+    return BidEvaluator.for_site(row.net_head_m, row.installed_flow_cms, row.elevation_masl or 0.0)
+
+
+def evaluate_plant(bind: Engine, plant_id: int, batch_size: int = 5000, rescore_all: bool = False) -> Dict:
+    """
+    Scores the bids of one plant and writes status/score back.
+
+    :param rescore_all: Re-evaluate every bid, not only PENDING ones
+    Bids without a promised_efficiency are left PENDING with a NULL score.
+
+    :return: {"plant_id", "bids", "batches", "unscored": bids left PENDING for missing efficiency,
+              "skipped": True if the plant has no hydrology data}
+    """
+    t = BidEvaluation.__table__
+    page = (
+        select(t.c.id, t.c.manufacturer, t.c.turbine_type, t.c.promised_efficiency, t.c.price_eur)
+        .where(t.c.plant_id == plant_id, t.c.id > bindparam("last_id"))
+        .order_by(t.c.id)
+        .limit(batch_size)
+    )
+    if not rescore_all:
+        page = page.where(t.c.status == PENDING)
+    write = (
+        update(t)
+        .where(t.c.id == bindparam("b_id"))
+        .values(status=bindparam("b_status"), score=bindparam("b_score"))
+    )
+
+    with bind.connect() as conn:
+        evaluator = _site_evaluator(conn, plant_id)
+    if evaluator is None:
+        return {"plant_id": plant_id, "bids": 0, "batches": 0, "unscored": 0, "skipped": True}
+
+    bids = batches = unscored = 0
+    last_id = 0
+    while True:
+        with bind.begin() as conn:
+            rows = conn.execute(page, {"last_id": last_id}).all()
+            if not rows:
+                break
+            # A bid without a promised efficiency cannot be judged: keep it PENDING (score NULL) rather than score it
+            scorable, params = [], []
+            for r in rows:
+                if r.promised_efficiency is not None and np.isfinite(r.promised_efficiency):
+                    scorable.append(r)
+                else:
+                    params.append({"b_id": r.id, "b_status": PENDING, "b_score": None})
+            if scorable:
+                result = evaluator.evaluate_offers({
+                    "manufacturer": [r.manufacturer for r in scorable],
+                    "turbine_type": [r.turbine_type or "" for r in scorable],
+                    "offered_efficiency": [r.promised_efficiency for r in scorable],
+                    "price_eur": [r.price_eur for r in scorable],
+                }, with_reports=False)
+                statuses = [DB_STATUS[STATUS_CODES[code]] for code in result["status"].tolist()]
+                params.extend(
+                    {"b_id": r.id, "b_status": status, "b_score": score}
+                    for r, status, score in zip(scorable, statuses, result["score"].tolist())
+                )
+            conn.execute(write, params)
+        unscored += len(rows) - len(scorable)
+        last_id = rows[-1].id
+        bids += len(rows)
+        batches += 1
+    return {"plant_id": plant_id, "bids": bids, "batches": batches, "unscored": unscored, "skipped": False}
+
+
+def run_pipeline(bind: Engine, plant_id: Optional[int] = None, batch_size: int = 5000, rescore_all: bool = False) -> Dict:
+    """Runs evaluate_plant for one plant or every plant; returns totals and timing."""
+    ensure_schema(bind)
+    if plant_id is not None:
+        plant_ids = [plant_id]
+    else:
+        with bind.connect() as conn:
+            plant_ids = conn.execute(select(Plant.__table__.c.id).order_by(Plant.__table__.c.id)).scalars().all()
+
+    t0 = time.perf_counter()
+    per_plant = [evaluate_plant(bind, pid, batch_size, rescore_all) for pid in plant_ids]
+    seconds = time.perf_counter() - t0
+    bids = sum(r["bids"] for r in per_plant)
+    return {
+        "plants": len(per_plant),
+        "skipped_plants": [r["plant_id"] for r in per_plant if r["skipped"]],
+        "bids": bids,
+        "unscored": sum(r["unscored"] for r in per_plant),
+        "seconds": round(seconds, 3),
+        "bids_per_sec": round(bids / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+# ==========================================
+# 3. SYNTHETIC BENCHMARK
+# ==========================================
+def _seed_synthetic(bind: Engine, n_bids: int, n_plants: int = 10, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    types = np.array(["francis", "kaplan", "pelton"])
+    with bind.begin() as conn:
+        conn.execute(Plant.__table__.insert(), [
+            {"id": i + 1, "name": f"Plant {i + 1}", "elevation_masl": float(rng.uniform(0, 1500))} for i in range(n_plants)
+        ])
+        conn.execute(HydrologyData.__table__.insert(), [
+            {"plant_id": i + 1, "net_head_m": float(rng.uniform(5, 400)), "installed_flow_cms": float(rng.uniform(1, 60))}
+            for i in range(n_plants)
+        ])
+        conn.execute(BidEvaluation.__table__.insert(), [
+            {"plant_id": int(pid), "manufacturer": f"Vendor {i % 50}", "turbine_type": str(tt),
+             "promised_efficiency": float(eff), "price_eur": float(price), "status": PENDING}
+            for i, (pid, tt, eff, price) in enumerate(zip(
+                rng.integers(1, n_plants + 1, n_bids), rng.choice(types, n_bids),
+                rng.uniform(88, 98, n_bids), rng.uniform(5e5, 5e6, n_bids)))
+        ])
+
+
+def run_benchmark(n_bids: int, batch_size: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = tune_sqlite(create_engine(f"sqlite:///{os.path.join(tmp, 'bids.db')}"))
+        ensure_schema(engine)
+        _seed_synthetic(engine, n_bids)
+        stats = run_pipeline(engine, batch_size=batch_size)
+        engine.dispose()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate stored bids and write status/score back")
+    parser.add_argument("--db", default=DATABASE_URL)
+    parser.add_argument("--plant", type=int, help="Only this plant id")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--rescore-all", action="store_true", help="Re-evaluate bids in every status, not only PENDING")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Score N synthetic bids in a temporary database")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        stats = run_benchmark(args.benchmark, args.batch_size)
+    else:
+        stats = run_pipeline(tune_sqlite(create_engine(args.db)), args.plant, args.batch_size, args.rescore_all)
+    print(f"✅ Evaluated {stats['bids']} bids across {stats['plants']} plants in {stats['seconds']}s ({stats['bids_per_sec']:,.0f} bids/s)")
+    if stats["unscored"]:
+        print(f"⚠️  {stats['unscored']} bids without promised_efficiency left PENDING")
+    if stats["skipped_plants"]:
+        print(f"⚠️  No hydrology data, skipped plants: {stats['skipped_plants']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+component_encyclopedia_pipeline.py
+
+One-pass extract -> filter -> SQL pipeline for the component encyclopedia.
+
+Chains the stages of extract_component_encyclopedia.py,
+filter_component_encyclopedia_seed.py and generate_component_encyclopedia_sql.py
+as generators: rows flow from the HTML tree straight into the SQL file, with
+no intermediate CSV unless a tap is requested. The SQL is identical to running
+the three scripts one after the other with the same options.
+
+Usage:
+  python scripts/component_encyclopedia_pipeline.py --out scripts/component_encyclopedia_seed.filtered.sql
+  python scripts/component_encyclopedia_pipeline.py --out seed.sql --seed-csv seed.csv --filtered-csv seed.filtered.csv
+  python scripts/component_encyclopedia_pipeline.py --out seed.sql --cache --parser lxml --batch-size 200 --min-chars 80
+"""
+import argparse
+import csv
+import os
+import time
+
+from extract_cache import DEFAULT_CACHE_PATH, DEFAULT_PARSER, PARSERS, ExtractCache, parser_available
+from extract_component_encyclopedia import EXTRACTOR_VERSION, FIELDNAMES, iter_rows
+from filter_component_encyclopedia_seed import MIN_CHARS, filter_rows
+from generate_component_encyclopedia_sql import iter_sql
+
+
+class Stage:
+    """
+    Wraps one generator stage and counts its items and the time spent in next().
+
+    Pulling from a stage also runs everything upstream of it, so the stage's
+    own cost is its time minus the upstream stage's time.
+    """
+
+    def __init__(self, name, items, upstream=None):
+        self.name = name
+        self.upstream = upstream
+        self.count = 0
+        self.seconds = 0.0
+        self._items = items
+
+    def __iter__(self):
+        it = iter(self._items)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.seconds += time.perf_counter() - t0
+                return
+            self.seconds += time.perf_counter() - t0
+            self.count += 1
+            yield item
+
+    @property
+    def own_seconds(self):
+        return self.seconds - (self.upstream.seconds if self.upstream is not None else 0.0)
+
+
+def csv_tap(rows, path):
+    """Passes rows through unchanged while writing them to a CSV file."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+            yield r
+
+
+def write_sql(chunks, path):
+    """Writes the iter_sql() chunks inside the usual BEGIN/COMMIT envelope, yielding the statement count of each."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('-- Generated upsert SQL for component_encyclopedia\n')
+        f.write('BEGIN;\n')
+        for text, _, statements in chunks:
+            f.write(text)
+            yield statements
+        f.write('COMMIT;\n')
+
+
+def run_pipeline(root, out, parser=DEFAULT_PARSER, cache=None, min_chars=MIN_CHARS, batch_size=1, jobs=1,
+                 seed_csv=None, filtered_csv=None):
+    """
+    :return: the list of Stage objects, in pipeline order (counts and timings filled in)
+    """
+    stages = [Stage('extract', iter_rows(root, parser, cache, jobs))]
+
+    def add(name, items):
+        stages.append(Stage(name, items, stages[-1]))
+
+    if seed_csv:
+        add(f'tap {seed_csv}', csv_tap(stages[-1], seed_csv))
+    add(f'filter >={min_chars} chars', filter_rows(stages[-1], min_chars))
+    if filtered_csv:
+        add(f'tap {filtered_csv}', csv_tap(stages[-1], filtered_csv))
+    add('render sql', iter_sql(stages[-1], batch_size))
+    add(f'write {out}', write_sql(stages[-1], out))
+    for _ in stages[-1]:
+        pass
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract -> filter -> SQL for component_encyclopedia in one pass')
+    parser.add_argument('--root', default='docs', help='root folder to scan (default: docs)')
+    parser.add_argument('--out', required=True, help='SQL output file')
+    parser.add_argument('--parser', choices=PARSERS, default=DEFAULT_PARSER, help='BeautifulSoup tree builder')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, help=f'Reuse results of unchanged files (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--min-chars', type=int, default=MIN_CHARS, help='Minimum description length (0 keeps every row)')
+    parser.add_argument('--batch-size', type=int, default=1, help='Rows per INSERT statement (1 = one statement per row)')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes parsing HTML (0 = one per CPU)')
+    parser.add_argument('--seed-csv', help='Also write the unfiltered rows to this CSV')
+    parser.add_argument('--filtered-csv', help='Also write the filtered rows to this CSV')
+    args = parser.parse_args()
+
+    if not parser_available(args.parser):
+        parser.error(f'parser {args.parser!r} is not installed (pip install {args.parser})')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be >= 1')
+
+    cache = ExtractCache(args.cache, 'extract_component_encyclopedia', f'{EXTRACTOR_VERSION}/{args.parser}') if args.cache else None
+    try:
+        stages = run_pipeline(args.root, args.out, args.parser, cache, args.min_chars, args.batch_size, args.jobs or os.cpu_count() or 1,
+                              args.seed_csv, args.filtered_csv)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    for stage in stages:
+        print(f'{stage.name:<40} {stage.count:>8} items {stage.own_seconds:8.2f}s')
+    print(f'Wrote {stages[-3].count} rows to {args.out} in {stages[-1].seconds:.2f}s')
+    if cache is not None:
+        print(cache.stats_line())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, JSON, DateTime, Boolean, Text
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, JSON, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 from datetime import datetime
 
@@ -51,6 +51,9 @@ class PipeSpecs(Base):
 
 class BidEvaluation(Base):
     __tablename__ = 'bid_evaluations'
+    __table_args__ = (
+        Index('ix_bid_evaluations_plant_status', 'plant_id', 'status', 'id'),
+    )
     id = Column(Integer, primary_key=True)
     plant_id = Column(Integer, ForeignKey('plants.id'))
     manufacturer = Column(String)
@@ -58,7 +61,8 @@ class BidEvaluation(Base):
     promised_efficiency = Column(Float)
     price_eur = Column(Float)
     delivery_months = Column(Integer)
-    status = Column(String) # PENDING, REJECTED, SHORTLIST
+    status = Column(String) # PENDING, REJECTED, NEGOTIATE, SHORTLIST
+    score = Column(Float) # BidEvaluator score (see bid_pipeline.py)
     
     plant = relationship("Plant", back_populates="bids")
 
@@ -102,6 +106,9 @@ class GeneratorSpec(Base):
 # ==========================================
 class SensorLog(Base):
     __tablename__ = 'sensor_logs'
+    __table_args__ = (
+        Index('ix_sensor_logs_turbine_ts', 'turbine_id', 'timestamp'),
+    )
     id = Column(Integer, primary_key=True)
     turbine_id = Column(Integer, ForeignKey('turbines.id'))
     timestamp = Column(DateTime, default=datetime.utcnow)
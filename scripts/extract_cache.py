@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+extract_cache.py
+
+Plumbing shared by the HTML extractors (extract_knowledge.py,
+extract_component_encyclopedia.py): BeautifulSoup parser selection, the golden
+parser comparison behind --verify-parser, and a persistent per-file cache.
+
+Entries are stored in a small SQLite file keyed by extractor name + file path,
+and are only reused when the file's sha256 and the extractor version both
+match, so editing a document or changing the heuristics invalidates exactly the
+affected rows. Nightly runs then parse only new or modified files.
+
+iter_cached_results() is the extractors' file loop: cache lookups, a bounded
+process pool for the misses, and results yielded in input order.
+
+Usage (from the extractors):
+    python scripts/extract_knowledge.py --cache --stats
+    python scripts/extract_component_encyclopedia.py --cache /tmp/extract.sqlite --stats
+
+    # Inspect the cache itself
+    python scripts/extract_cache.py --cache scripts/.extract_cache.sqlite
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# BeautifulSoup tree builders; html.parser is the reference, the others are optional C/pure-Python installs
+PARSERS = ('html.parser', 'lxml', 'html5lib')
+DEFAULT_PARSER = 'html.parser'
+
+DEFAULT_CACHE_PATH = 'scripts/.extract_cache.sqlite'
+COMMIT_EVERY = 500
+
+# Files in flight per worker process in iter_cached_results()
+PENDING_PER_JOB = 4
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS extract_cache (
+    extractor TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    version TEXT NOT NULL,
+    entries TEXT NOT NULL,
+    PRIMARY KEY (extractor, path)
+)
+'''
+
+
+# ==========================================
+# 1. PARSERS
+# ==========================================
+def parser_available(parser: str) -> bool:
+    try:
+        BeautifulSoup('', parser)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+def verify_parser(paths: Iterable, candidate: str, read: Callable[[Any], str],
+                  extract: Callable[[str, Any, str], Any]) -> Dict:
+    """
+    Golden comparison: extraction output with `candidate` vs. html.parser for
+    every file, plus parse+extract time of both.
+
+    :param read: path -> markup (not timed)
+    :param extract: (markup, path, parser) -> extraction output
+    """
+    times = {DEFAULT_PARSER: 0.0, candidate: 0.0}
+    differing = []
+    files = 0
+    for path in paths:
+        markup = read(path)
+        outputs = {}
+        for parser in times:
+            t0 = time.perf_counter()
+            outputs[parser] = extract(markup, path, parser)
+            times[parser] += time.perf_counter() - t0
+        if outputs[candidate] != outputs[DEFAULT_PARSER]:
+            differing.append(str(path))
+        files += 1
+    return {'files': files, 'seconds': times, 'differing': differing}
+
+
+# ==========================================
+# 2. PER-FILE CACHE
+# ==========================================
+def file_digest(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ExtractCache:
+    """
+    sha256-validated cache of one extractor's per-file results.
+
+    Values must be JSON serializable (tuples come back as lists).
+    Use as a context manager, or call close() to flush pending writes.
+    """
+
+    def __init__(self, path: str, extractor: str, version: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(SCHEMA)
+        self.extractor = extractor
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+
+    def get(self, path: str, digest: str) -> Optional[Any]:
+        row = self.conn.execute(
+            'SELECT entries FROM extract_cache WHERE extractor = ? AND path = ? AND sha256 = ? AND version = ?',
+            (self.extractor, str(path), digest, self.version),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, path: str, digest: str, entries: Any) -> None:
+        self.conn.execute(
+            'INSERT OR REPLACE INTO extract_cache (extractor, path, sha256, version, entries) VALUES (?, ?, ?, ?, ?)',
+            (self.extractor, str(path), digest, self.version, json.dumps(entries, ensure_ascii=False)),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.flush()
+
+    def prune(self, keep_paths: Iterable, roots: Iterable) -> int:
+        """
+        Drops rows of this extractor for files under `roots` that were not part
+        of the current run (deleted or renamed). Rows outside the scanned roots
+        are kept, so a run over a narrower --source/--root, or from another
+        working directory (paths are stored as given), does not evict them.
+        """
+        keep = {str(p) for p in keep_paths}
+        scope = [Path(r).parts for r in roots]
+        stale = [
+            (self.extractor, p) for (p,) in self.conn.execute('SELECT path FROM extract_cache WHERE extractor = ?', (self.extractor,))
+            if p not in keep and any(Path(p).parts[:len(parts)] == parts for parts in scope)
+        ]
+        self.conn.executemany('DELETE FROM extract_cache WHERE extractor = ? AND path = ?', stale)
+        self.flush()
+        return len(stale)
+
+    def flush(self) -> None:
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    def stats_line(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f'cache: {self.hits} hits, {self.misses} misses ({rate:.1%} hit rate)'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==========================================
+# 3. FILE LOOP
+# ==========================================
+def iter_cached_results(paths: Iterable, extract: Callable[[Any], Tuple[Optional[str], Any]], jobs: int = 1,
+                        cache: Optional[ExtractCache] = None,
+                        decode: Optional[Callable[[Any], Any]] = None) -> Iterator[Tuple[Any, Any]]:
+    """
+    Yields (path, result) for every path, in input order.
+
+    With jobs > 1 cache misses are parsed in a process pool; results are
+    yielded in submission order, so output is identical to jobs=1, and at most
+    PENDING_PER_JOB * jobs files are in flight, so memory does not grow with
+    the corpus. With a cache, files whose content hash is known are not parsed.
+
+    :param extract: path -> (sha256 or None if unreadable, result); must be picklable for jobs > 1
+    :param decode: Applied to results read back from the cache (JSON round trip, e.g. lists -> tuples)
+    """
+    def finish(path, outcome):
+        digest, result = outcome
+        if cache is not None and digest is not None:
+            cache.put(path, digest, result)
+        return result
+
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pending = deque()  # (path, future) or (path, result) in input order
+    try:
+        for path in paths:
+            result = None
+            if cache is not None:
+                try:
+                    with open(path, 'rb') as f:
+                        result = cache.get(path, file_digest(f.read()))
+                except OSError:
+                    pass
+                if result is not None and decode is not None:
+                    result = decode(result)
+            if result is None and pool is None:
+                result = finish(path, extract(path))
+            pending.append((path, result if result is not None else pool.submit(extract, path)))
+            while pending and (pool is None or len(pending) > PENDING_PER_JOB * jobs or not isinstance(pending[0][1], Future)):
+                done, item = pending.popleft()
+                yield done, finish(done, item.result()) if isinstance(item, Future) else item
+        while pending:
+            done, item = pending.popleft()
+            yield done, finish(done, item.result()) if isinstance(item, Future) else item
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize an extractor cache file')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.cache)
+    conn.execute(SCHEMA)
+    for extractor, version, files, size in conn.execute(
+        'SELECT extractor, version, COUNT(*), SUM(LENGTH(entries)) FROM extract_cache GROUP BY extractor, version ORDER BY extractor'
+    ):
+        print(f'{extractor:<28} version {version:<16} {files:>6} files {size or 0:>10} bytes')
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
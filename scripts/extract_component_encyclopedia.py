@@ -5,6 +5,10 @@ and emits a CSV suitable for bulk import into component_encyclopedia.
 
 Usage:
   python scripts/extract_component_encyclopedia.py --out scripts/component_encyclopedia_seed.csv
+  python scripts/extract_component_encyclopedia.py --cache --stats   # only re-parse new/modified files
+  python scripts/extract_component_encyclopedia.py --parser lxml     # C-backed parser (pip install lxml)
+  python scripts/extract_component_encyclopedia.py --verify-parser lxml   # golden comparison against html.parser
+  python scripts/extract_component_encyclopedia.py --jobs 0 --cache  # parse in one worker per CPU
 
 This script is intentionally conservative: it looks for headings near keywords like
 "Definition","Function","Purpose" and captures the following paragraph(s).
@@ -13,62 +17,164 @@ import argparse
 import csv
 import os
 import re
-from bs4 import BeautifulSoup
+import sys
+from functools import partial
+from bs4 import BeautifulSoup, Tag
 
+from extract_cache import (DEFAULT_CACHE_PATH, DEFAULT_PARSER, PARSERS, ExtractCache, file_digest, iter_cached_results,
+                           parser_available, verify_parser)
 
-def extract_from_html(path):
-    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        txt = f.read()
-    soup = BeautifulSoup(txt, 'html.parser')
-    candidates = []
-    # find headings
-    for h in soup.find_all(re.compile('^h[1-6]$')):
+# Bump when the heuristics change so cached results are invalidated
+EXTRACTOR_VERSION = '1'
+
+HEADING_RE = re.compile('^h[1-6]$')
+KEYWORD_RE = re.compile(r'\b(Definition|Function|Purpose|Description)\b', re.I)
+LEADING_LABEL_RE = re.compile(r'^(Definition|Function|Purpose):\s*(.+)', re.I)
+
+FIELDNAMES = ['component_name', 'description', 'physics_principle', 'common_failure_modes']
+
+
+def read_html(path):
+    """Returns (text, sha256); text matches open(path, encoding='utf-8', errors='ignore').read()."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    txt = raw.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+    return txt, file_digest(raw)
+
+
+def extract_from_html(path, parser=DEFAULT_PARSER):
+    return extract_from_markup(read_html(path)[0], parser)
+
+
+def extract_file(path, parser=DEFAULT_PARSER):
+    """Returns (sha256, candidates); runs in worker processes with --jobs."""
+    txt, digest = read_html(path)
+    return digest, extract_from_markup(txt, parser)
+
+
+def extract_from_markup(txt, parser=DEFAULT_PARSER):
+    return extract_from_soup(BeautifulSoup(txt, parser))
+
+
+def extract_from_soup(soup):
+    """
+    Heading sections + 'Definition:' paragraphs, in the same order as the
+    reference implementation in extractor_benchmark.py.
+
+    Instead of walking find_next_siblings() from every matching heading
+    (quadratic on long pages), each parent's children are walked once: any
+    h1-h6 sibling closes the open sections, <p> siblings are appended to them.
+    """
+    headings = soup.find_all(HEADING_RE)
+    sections = {}  # id(heading) -> (heading text, paragraphs)
+    parents = {}
+    for h in headings:
         htext = h.get_text(separator=' ').strip()
-        if re.search(r'\b(Definition|Function|Purpose|Description)\b', htext, re.I):
-            # grab following siblings paragraphs
-            desc = []
-            for sib in h.find_next_siblings():
-                if sib.name and re.match('^h[1-6]$', sib.name):
-                    break
-                if sib.name == 'p':
-                    desc.append(sib.get_text(separator=' ').strip())
-            if desc:
-                candidates.append((htext, '\n\n'.join(desc)))
+        if KEYWORD_RE.search(htext):
+            sections[id(h)] = (htext, [])
+            if h.parent is not None:
+                parents.setdefault(id(h.parent), h.parent)
+    for parent in parents.values():
+        open_sections = []
+        for sib in parent.children:
+            if not isinstance(sib, Tag):
+                continue
+            if sib.name and HEADING_RE.match(sib.name):
+                open_sections = []
+            elif sib.name == 'p' and open_sections:
+                ptext = sib.get_text(separator=' ').strip()
+                for desc in open_sections:
+                    desc.append(ptext)
+            section = sections.get(id(sib))
+            if section is not None:
+                open_sections.append(section[1])
+
+    candidates = []
+    for h in headings:
+        section = sections.get(id(h))
+        if section is not None and section[1]:
+            candidates.append((section[0], '\n\n'.join(section[1])))
     # fallback: look for <p> with leading 'Definition:' or 'Function:'
     for p in soup.find_all('p'):
         ptext = p.get_text(separator=' ').strip()
-        m = re.match(r'^(Definition|Function|Purpose):\s*(.+)', ptext, re.I)
+        m = LEADING_LABEL_RE.match(ptext)
         if m:
             candidates.append((m.group(1), m.group(2)))
     return candidates
 
 
+def iter_html_files(root):
+    for dirpath, _, files in os.walk(root):
+        for fn in files:
+            if fn.lower().endswith('.html'):
+                yield os.path.join(dirpath, fn)
+
+
+def iter_extracted(root, parser=DEFAULT_PARSER, cache=None, jobs=1):
+    """Yields (path, candidates) for every HTML file under root, in os.walk order (see iter_cached_results)."""
+    return iter_cached_results(iter_html_files(root), partial(extract_file, parser=parser), jobs, cache,
+                               decode=lambda cand: [tuple(c) for c in cand])
+
+
+def candidate_rows(path, cand):
+    """component_encyclopedia CSV rows for the candidates of one file."""
+    base = os.path.splitext(os.path.basename(path))[0]
+    for title, desc in cand:
+        # create a best-effort component_name from filename + title
+        comp = f"{base}:{title}"[:200]
+        yield {'component_name': comp, 'description': desc, 'physics_principle': '', 'common_failure_modes': '[]'}
+
+
+def iter_rows(root, parser=DEFAULT_PARSER, cache=None, jobs=1):
+    """Streams the CSV rows of the whole tree (no intermediate list)."""
+    for path, cand in iter_extracted(root, parser, cache, jobs):
+        yield from candidate_rows(path, cand)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--root', default='docs', help='root folder to scan (default: docs)')
     parser.add_argument('--out', default='scripts/component_encyclopedia_seed.csv')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, help=f'Reuse results of unchanged files (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--stats', action='store_true', help='Report cache hits/misses')
+    parser.add_argument('--parser', choices=PARSERS, default=DEFAULT_PARSER, help='BeautifulSoup tree builder')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes (0 = one per CPU)')
+    parser.add_argument('--verify-parser', choices=PARSERS[1:], metavar='PARSER',
+                        help='Compare output of PARSER against html.parser on every file; writes nothing')
     args = parser.parse_args()
 
-    rows = []
-    for root, _, files in os.walk(args.root):
-        for fn in files:
-            if not fn.lower().endswith('.html'): continue
-            path = os.path.join(root, fn)
-            cand = extract_from_html(path)
-            for title, desc in cand:
-                # create a best-effort component_name from filename + title
-                base = os.path.splitext(os.path.basename(path))[0]
-                comp = f"{base}:{title}"[:200]
-                rows.append({'component_name': comp, 'description': desc, 'physics_principle': '', 'common_failure_modes': '[]'})
-
+    for name in {args.parser, args.verify_parser} - {None}:
+        if not parser_available(name):
+            parser.error(f'parser {name!r} is not installed (pip install {name})')
+    if args.verify_parser:
+        result = verify_parser(iter_html_files(args.root), args.verify_parser, lambda path: read_html(path)[0],
+                               lambda txt, path, parser: extract_from_markup(txt, parser))
+        ref_s, cand_s = result['seconds'][DEFAULT_PARSER], result['seconds'][args.verify_parser]
+        print(f"{args.verify_parser} vs {DEFAULT_PARSER} over {result['files']} files: "
+              f"{cand_s:.1f}s vs {ref_s:.1f}s ({ref_s / max(cand_s, 1e-9):.2f}x), {len(result['differing'])} files with different output")
+        for path in result['differing'][:20]:
+            print(f'    {path}')
+        sys.exit(1 if result['differing'] else 0)
+    cache = ExtractCache(args.cache, 'extract_component_encyclopedia', f'{EXTRACTOR_VERSION}/{args.parser}') if args.cache else None
+    seen_paths = []
+    written = 0
     with open(args.out, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['component_name', 'description', 'physics_principle', 'common_failure_modes']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
         writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        for path, cand in iter_extracted(args.root, args.parser, cache, args.jobs or os.cpu_count() or 1):
+            seen_paths.append(path)
+            for r in candidate_rows(path, cand):
+                writer.writerow(r)
+                written += 1
 
-    print(f'Wrote {len(rows)} rows to {args.out}')
+    print(f'Wrote {written} rows to {args.out}')
+    pruned = 0
+    if cache is not None:
+        # Drop entries of deleted/renamed files under the scanned roots so the cache does not grow forever
+        pruned = cache.prune(seen_paths, [args.root])
+        cache.close()
+    if args.stats:
+        print(f'{cache.stats_line()}, {pruned} stale entries pruned' if cache is not None else f'cache: disabled, parsed {len(seen_paths)} files')
 
 
 if __name__ == '__main__':
@@ -8,6 +8,12 @@ suitable for insertion into `public.expert_knowledge_base`.
 
 Usage:
     python scripts/extract_knowledge.py --source docs public --out extracted_expert_knowledge.json
+    python scripts/extract_knowledge.py --jobs 8   # parse files in 8 worker processes
+    python scripts/extract_knowledge.py --cache --stats   # only re-parse new/modified files
+    python scripts/extract_knowledge.py --ndjson extracted.ndjson   # stream entries as files are processed
+    python scripts/extract_knowledge.py --near-dup        # also merge near-duplicates (see knowledge_dedup.py)
+    python scripts/extract_knowledge.py --parser lxml     # C-backed parser (pip install lxml)
+    python scripts/extract_knowledge.py --verify-parser lxml   # golden comparison against html.parser
 
 Heuristics:
 - Looks for headings or labels containing 'symptom', 'diagnosis', 'recommended', 'action', 'severity'
@@ -16,12 +22,27 @@ Heuristics:
 
 """
 import argparse
+import hashlib
 import json
+import os
 import re
+import sqlite3
+import sys
+import tempfile
+import time
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+from extract_cache import (DEFAULT_CACHE_PATH, DEFAULT_PARSER, PARSERS, ExtractCache, file_digest, iter_cached_results,
+                           parser_available, verify_parser)
+from knowledge_dedup import near_dedupe
+
+# Bump when the heuristics change so cached results are invalidated
+EXTRACTOR_VERSION = '1'
 
-from bs4 import BeautifulSoup
 
 SEVERITY_MAP = {
     'critical': 'CRITICAL',
@@ -42,159 +63,234 @@ def normalize_severity(text: Optional[str]) -> str:
         return 'HIGH'
     return 'MEDIUM'
 
-def extract_from_html(path: Path) -> List[Dict]:
-    results = []
+def decode_html(raw: bytes) -> str:
+    """Same result as Path.read_text: utf-8, else latin-1, with universal newlines."""
     try:
-        html = path.read_text(encoding='utf-8')
-    except Exception:
-        try:
-            html = path.read_text(encoding='latin-1')
-        except Exception:
-            return results
-
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # Collect text blocks that look promising
-    text = soup.get_text(separator='\n')
-
-    # Heuristic patterns and label synonyms
-    patterns = [r"Symptom[:\s]+(.+)", r"Diagnosis[:\s]+(.+)", r"Recommended action[:\s]+(.+)", r"Recommended[:\s]+(.+)", r"Severity[:\s]+(.+)"]
-    LABEL_SYNONYMS = {
-        'issue': 'symptom',
-        'observation': 'symptom',
-        'finding': 'symptom',
-        'sign': 'symptom',
-        'cause': 'actual_cause',
-        'root cause': 'actual_cause',
-        'remedy': 'recommended_action',
-        'resolution': 'recommended_action',
-        'fix': 'recommended_action',
-        'action': 'recommended_action'
-    }
-
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-
-    # Attempt sliding window to capture groups: symptom -> diagnosis -> recommended
+        html = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        html = raw.decode('latin-1')
+    return html.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def extract_file(path: Path, parser: str = DEFAULT_PARSER):
+    """Reads one file and returns (sha256, entries); entries are [] if the file cannot be read."""
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None, []
+    return file_digest(raw), extract_from_markup(decode_html(raw), path, parser)
+
+
+def extract_from_html(path: Path, parser: str = DEFAULT_PARSER) -> List[Dict]:
+    return extract_file(path, parser)[1]
+
+
+# Precompiled patterns (extractor_benchmark.py keeps the original inline versions as the reference)
+SYMPTOM_LINE_RE = re.compile(r"Symptom[:\s]+(.+)", re.I)
+DIAGNOSIS_LINE_RE = re.compile(r"Diagnosis[:\s]+(.+)", re.I)
+RECOMMENDED_ACTION_LINE_RE = re.compile(r"Recommended action[:\s]+(.+)", re.I)
+RECOMMENDED_LINE_RE = re.compile(r"Recommended[:\s]+(.+)", re.I)
+SEVERITY_LINE_RE = re.compile(r"Severity[:\s]+(.+)", re.I)
+LABEL_RE = re.compile(r'^(\w[\w\s]{1,40})[:\s]+(.+)')
+# Same set of names as re.compile('^h[1-6]$', re.I) matches
+HEADER_NAMES = frozenset(f'{h}{i}' for h in 'hH' for i in range(1, 7))
+SYMPTOM_GATE_RE = re.compile('symptom', re.I)
+
+LABEL_SYNONYMS = {
+    'issue': 'symptom',
+    'observation': 'symptom',
+    'finding': 'symptom',
+    'sign': 'symptom',
+    'cause': 'actual_cause',
+    'root cause': 'actual_cause',
+    'remedy': 'recommended_action',
+    'resolution': 'recommended_action',
+    'fix': 'recommended_action',
+    'action': 'recommended_action'
+}
+# One alternation per target field; "any synonym in text" == one search
+SYMPTOM_SYN_RE = re.compile('|'.join(re.escape(k) for k, v in LABEL_SYNONYMS.items() if v == 'symptom'))
+CAUSE_SYN_RE = re.compile('|'.join(re.escape(k) for k, v in LABEL_SYNONYMS.items() if v == 'actual_cause'))
+ACTION_SYN_RE = re.compile('|'.join(re.escape(k) for k, v in LABEL_SYNONYMS.items() if v == 'recommended_action'))
+RECOMMENDED_KEY_RE = re.compile('recommended|action|resolution|remedy|fix')
+
+PARA_GATE_RE = re.compile(r'symptom|issue|observation', re.I)
+PARA_SYMPTOM_RE = re.compile(r'Symptom[:\s]+([^\n\r;]+)', re.I)
+PARA_DIAGNOSIS_RE = re.compile(r'Diagnosis[:\s]+([^\n\r;]+)', re.I)
+PARA_RECOMMENDED_RE = re.compile(r'(Recommended action|Recommended)[:\s]+([^\n\r;]+)', re.I)
+PARA_SYMPTOM_ALT_RE = re.compile(r'(Issue|Observation|Finding)[:\s]+([^\n\r;]+)', re.I)
+PARA_RECOMMENDED_ALT_RE = re.compile(r'(Resolution|Remedy|Fix|Action)[:\s]+([^\n\r;]+)', re.I)
+
+
+def _scan_soup(soup: BeautifulSoup):
+    """
+    Single traversal of the tree. Returns
+    (document text as soup.get_text('\n') would build it,
+     [(header tag, header text)], [paragraph text]) with tags in document order.
+    """
+    types = soup.interesting_string_types
+    strings = []
+    headers = []
+    paras = []
+    collecting = []  # text buffers of the currently open <h*>/<p> tags
+    stack = [(iter(soup.contents), None)]
+    while stack:
+        children, buf = stack[-1]
+        for child in children:
+            if type(child) in types:
+                strings.append(child)
+                for open_buf in collecting:
+                    open_buf.append(child)
+                continue
+            if not isinstance(child, Tag):
+                continue  # comments, doctype, script/style text
+            name = child.name
+            child_buf = None
+            if name == 'p':
+                child_buf = []
+                paras.append(child_buf)
+            elif name in HEADER_NAMES:
+                child_buf = []
+                headers.append((child, child_buf))
+            if child_buf is not None:
+                collecting.append(child_buf)
+            stack.append((iter(child.contents), child_buf))
+            break
+        else:
+            stack.pop()
+            if buf is not None:
+                collecting.pop()
+    return (
+        '\n'.join(strings),
+        [(tag, ''.join(buf)) for tag, buf in headers],
+        [''.join(buf) for buf in paras],
+    )
+
+
+def _after_colon(text: str) -> str:
+    return text.split(':', 1)[-1].strip() if ':' in text else ''
+
+
+def extract_from_soup(soup: BeautifulSoup, path: Path) -> List[Dict]:
+    results = []
+    text, headers, paras = _scan_soup(soup)
+    source_file = str(path)
+
+    # Heuristic 1: sliding window over text lines: symptom -> diagnosis -> recommended
+    # (most documents never mention a symptom, so skip splitting them into lines)
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()] if SYMPTOM_GATE_RE.search(text) else []
     for i, line in enumerate(lines):
-        m_sym = re.search(patterns[0], line, re.IGNORECASE)
-        if m_sym:
-            symptom = m_sym.group(1).strip()
-            diagnosis = ''
-            recommended = ''
-            severity = None
-            # look ahead up to 8 lines
-            for j in range(i+1, min(i+8, len(lines))):
-                l = lines[j]
-                m_diag = re.search(patterns[1], l, re.IGNORECASE)
-                if m_diag and not diagnosis:
+        m_sym = SYMPTOM_LINE_RE.search(line)
+        if not m_sym:
+            continue
+        symptom = m_sym.group(1).strip()
+        diagnosis = ''
+        recommended = ''
+        severity = None
+        # look ahead up to 8 lines
+        for nxt in lines[i+1:i+8]:
+            if not diagnosis:
+                m_diag = DIAGNOSIS_LINE_RE.search(nxt)
+                if m_diag:
                     diagnosis = m_diag.group(1).strip()
                     continue
-                m_rec = re.search(patterns[2], l, re.IGNORECASE) or re.search(patterns[3], l, re.IGNORECASE)
-                if m_rec and not recommended:
+            if not recommended:
+                m_rec = RECOMMENDED_ACTION_LINE_RE.search(nxt) or RECOMMENDED_LINE_RE.search(nxt)
+                if m_rec:
                     recommended = m_rec.group(1).strip()
                     continue
-                m_sev = re.search(patterns[4], l, re.IGNORECASE)
-                if m_sev and not severity:
+            if not severity:
+                m_sev = SEVERITY_LINE_RE.search(nxt)
+                if m_sev:
                     severity = normalize_severity(m_sev.group(1))
-                # try to match label synonyms like 'Issue:', 'Resolution:'
-                m_label = re.match(r'^(\w[\w\s]{1,40})[:\s]+(.+)', l)
-                if m_label:
-                    label = m_label.group(1).strip().lower()
-                    val = m_label.group(2).strip()
-                    mapped = LABEL_SYNONYMS.get(label)
-                    if mapped == 'symptom' and not symptom:
-                        symptom = val
-                    if mapped == 'recommended_action' and not recommended:
-                        recommended = val
-                    if mapped == 'actual_cause' and not diagnosis:
-                        diagnosis = val
-                    continue
+            # label synonyms like 'Issue:', 'Resolution:'
+            m_label = LABEL_RE.match(nxt)
+            if m_label:
+                mapped = LABEL_SYNONYMS.get(m_label.group(1).strip().lower())
+                val = m_label.group(2).strip()
+                if mapped == 'symptom' and not symptom:
+                    symptom = val
+                if mapped == 'recommended_action' and not recommended:
+                    recommended = val
+                if mapped == 'actual_cause' and not diagnosis:
+                    diagnosis = val
+        results.append({
+            'symptom_key': symptom.upper().replace(' ', '_'),
+            'diagnosis': diagnosis or '',
+            'recommended_action': recommended or '',
+            'severity': severity or 'MEDIUM',
+            'source_file': source_file
+        })
+
+    # Heuristic 2: structured blocks: <h*>Symptom</h*> followed by <p>
+    for header, htext in headers:
+        if 'symptom' not in htext.strip().lower():
+            continue
+        symptom = ''
+        diagnosis = ''
+        recommended = ''
+        severity = None
+        # symptom could be in the next sibling paragraph
+        sib = header.find_next_sibling()
+        if sib:
+            symptom = sib.get_text().strip()
+        # find next elements for diagnosis/recommended
+        for n in header.find_all_next(limit=12):
+            nt = n.get_text().strip()
+            low = nt.lower()
+            if not diagnosis and 'diagnosis' in low:
+                diagnosis = _after_colon(nt)
+            if not recommended and RECOMMENDED_KEY_RE.search(low):
+                recommended = _after_colon(nt)
+            if not severity and 'severity' in low:
+                severity = normalize_severity(nt.split(':',1)[-1].strip() if ':' in nt else nt)
+            # synonyms like 'Issue' or 'Observation'
+            value = nt.split(':',1)[-1].strip() if ':' in nt else nt
+            if not symptom and SYMPTOM_SYN_RE.search(low):
+                symptom = value
+            if not recommended and ACTION_SYN_RE.search(low):
+                recommended = value
+            if not diagnosis and CAUSE_SYN_RE.search(low):
+                diagnosis = value
+            if symptom and diagnosis and recommended:
+                break
+        if symptom:
             results.append({
-                'symptom_key': symptom.upper().replace(' ', '_'),
-                'diagnosis': diagnosis or '',
-                'recommended_action': recommended or '',
+                'symptom_key': symptom.upper().replace(' ', '_')[:60],
+                'diagnosis': diagnosis,
+                'recommended_action': recommended,
                 'severity': severity or 'MEDIUM',
-                'source_file': str(path)
+                'source_file': source_file
             })
 
-    # Heuristic 2: look for structured blocks: <h*>Symptom</h*> followed by <p>
-    for header in soup.find_all(re.compile('^h[1-6]$', re.I)):
-        htext = header.get_text().strip().lower()
-        if 'symptom' in htext:
-            symptom = ''
-            diagnosis = ''
-            recommended = ''
-            severity = None
-            # symptom could be in the next sibling paragraph
-            sib = header.find_next_sibling()
-            if sib:
-                symptom = sib.get_text().strip()
-            # find next elements for diagnosis/recommended
-            for n in header.find_all_next(limit=12):
-                nt = n.get_text().strip()
-                low = nt.lower()
-                if not diagnosis and 'diagnosis' in low:
-                    diagnosis = nt.split(':',1)[-1].strip() if ':' in nt else ''
-                if not recommended and ('recommended' in low or 'action' in low or 'resolution' in low or 'remedy' in low or 'fix' in low):
-                    recommended = nt.split(':',1)[-1].strip() if ':' in nt else ''
-                if not severity and 'severity' in low:
-                    severity = normalize_severity(nt.split(':',1)[-1].strip() if ':' in nt else nt)
-                # catch synonyms like 'Issue' or 'Observation'
-                for syn, kind in LABEL_SYNONYMS.items():
-                    if syn in low:
-                        if kind == 'symptom' and not symptom:
-                            symptom = nt.split(':',1)[-1].strip() if ':' in nt else nt
-                        if kind == 'recommended_action' and not recommended:
-                            recommended = nt.split(':',1)[-1].strip() if ':' in nt else nt
-                        if kind == 'actual_cause' and not diagnosis:
-                            diagnosis = nt.split(':',1)[-1].strip() if ':' in nt else nt
-                if symptom and diagnosis and recommended:
-                    break
-            if symptom:
-                results.append({
-                    'symptom_key': symptom.upper().replace(' ', '_')[:60],
-                    'diagnosis': diagnosis,
-                    'recommended_action': recommended,
-                    'severity': severity or 'MEDIUM',
-                    'source_file': str(path)
-                })
-
     # Heuristic 3: pattern-matching paragraphs for trio
-    para_texts = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
-    for p in para_texts:
-        # if contains the words symptom and diagnosis and recommended (or synonyms)
-        if re.search(r'symptom', p, re.I) or re.search(r'issue', p, re.I) or re.search(r'observation', p, re.I):
-            # try to extract fields
-            symptom = ''
-            diagnosis = ''
-            recommended = ''
-            m_sym = re.search(r'Symptom[:\s]+([^\n\r;]+)', p, re.I)
-            m_diag = re.search(r'Diagnosis[:\s]+([^\n\r;]+)', p, re.I)
-            m_rec = re.search(r'(Recommended action|Recommended)[:\s]+([^\n\r;]+)', p, re.I)
-            # additional patterns
-            if not m_sym:
-                m_sym = re.search(r'(Issue|Observation|Finding)[:\s]+([^\n\r;]+)', p, re.I)
-            if not m_rec:
-                m_rec = re.search(r'(Resolution|Remedy|Fix|Action)[:\s]+([^\n\r;]+)', p, re.I)
-            if m_sym:
-                # group 2 may exist for the alternative patterns
-                symptom = (m_sym.group(2) if m_sym.lastindex and m_sym.lastindex >= 2 else m_sym.group(1)).strip()
-            if m_diag:
-                diagnosis = m_diag.group(1).strip()
-            if m_rec:
-                recommended = m_rec.group(2).strip()
-            if symptom:
-                results.append({
-                    'symptom_key': symptom.upper().replace(' ', '_')[:60],
-                    'diagnosis': diagnosis,
-                    'recommended_action': recommended,
-                    'severity': 'MEDIUM',
-                    'source_file': str(path)
-                })
+    for p in paras:
+        p = p.strip()
+        if not p or not PARA_GATE_RE.search(p):
+            continue
+        m_sym = PARA_SYMPTOM_RE.search(p) or PARA_SYMPTOM_ALT_RE.search(p)
+        if not m_sym:
+            continue
+        m_diag = PARA_DIAGNOSIS_RE.search(p)
+        m_rec = PARA_RECOMMENDED_RE.search(p) or PARA_RECOMMENDED_ALT_RE.search(p)
+        # group 2 exists for the alternative patterns
+        symptom = (m_sym.group(2) if m_sym.lastindex and m_sym.lastindex >= 2 else m_sym.group(1)).strip()
+        if symptom:
+            results.append({
+                'symptom_key': symptom.upper().replace(' ', '_')[:60],
+                'diagnosis': m_diag.group(1).strip() if m_diag else '',
+                'recommended_action': m_rec.group(2).strip() if m_rec else '',
+                'severity': 'MEDIUM',
+                'source_file': source_file
+            })
 
     return results
 
 
+def extract_from_markup(html: str, path: Path, parser: str = DEFAULT_PARSER) -> List[Dict]:
+    return extract_from_soup(BeautifulSoup(html, parser), path)
+
+
 def find_html_files(paths: List[Path]) -> List[Path]:
     files = []
     for p in paths:
@@ -202,38 +298,133 @@ def find_html_files(paths: List[Path]) -> List[Path]:
             files.extend([f for f in p.rglob('*.html')])
         elif p.is_file() and p.suffix.lower() == '.html':
             files.append(p)
-    return files
+    # rglob order depends on the filesystem; sort so output is reproducible
+    return sorted(files)
+
+
+def iter_extracted(files: List[Path], jobs: int = 1, cache: Optional[ExtractCache] = None,
+                   parser: str = DEFAULT_PARSER) -> Iterator[List[Dict]]:
+    """Yields the extracted entries of every file, in the order of `files` (see iter_cached_results)."""
+    for _, entries in iter_cached_results(files, partial(extract_file, parser=parser), jobs, cache):
+        yield entries
+
+
+class DiskKeySet:
+    """
+    Set of dedup keys kept in SQLite instead of RAM (16-byte blake2b digests),
+    so streaming runs use flat memory however many entries they see.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._tmpdir = None
+        if path is None:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            path = os.path.join(self._tmpdir.name, 'seen.sqlite')
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA synchronous=OFF')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY) WITHOUT ROWID')
+
+    @staticmethod
+    def _digest(key) -> bytes:
+        return hashlib.blake2b(json.dumps(key, ensure_ascii=False).encode('utf-8'), digest_size=16).digest()
+
+    def __contains__(self, key) -> bool:
+        return self.conn.execute('SELECT 1 FROM seen WHERE key = ?', (self._digest(key),)).fetchone() is not None
+
+    def add(self, key) -> None:
+        self.conn.execute('INSERT OR IGNORE INTO seen (key) VALUES (?)', (self._digest(key),))
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+
+def dedupe_entries(batches: Iterable[List[Dict]], seen=None) -> Iterator[Dict]:
+    """
+    Incremental dedup by symptom_key + diagnosis; the first occurrence wins.
+    :param seen: Set-like store of keys (default: in-memory set; DiskKeySet for flat memory)
+    """
+    seen = set() if seen is None else seen
+    for entries in batches:
+        for e in entries:
+            key = (e['symptom_key'], e['diagnosis'])
+            if key in seen: continue
+            seen.add(key)
+            yield e
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--source', nargs='+', default=['docs', 'public'], help='Source directories to scan')
     parser.add_argument('--out', default='scripts/extracted_expert_knowledge.json', help='Output JSON file')
+    parser.add_argument('--ndjson', metavar='PATH', help='Stream entries as NDJSON to PATH (instead of --out), with an on-disk dedup set')
+    parser.add_argument('--dedup-db', metavar='PATH', help='SQLite file for the --ndjson dedup set (default: temporary); reuse it to skip keys seen in earlier runs')
+    parser.add_argument('--near-dup', action='store_true', help='Merge near-duplicate entries (MinHash/LSH) and write <out>.clusters.json')
+    parser.add_argument('--near-dup-threshold', type=float, default=0.6, help='Estimated Jaccard similarity to merge')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes (0 = one per CPU)')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, help=f'Reuse results of unchanged files (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--stats', action='store_true', help='Report cache hits/misses')
+    parser.add_argument('--parser', choices=PARSERS, default=DEFAULT_PARSER, help='BeautifulSoup tree builder')
+    parser.add_argument('--verify-parser', choices=PARSERS[1:], metavar='PARSER',
+                        help='Compare extraction output of PARSER against html.parser on every file; writes nothing')
     args = parser.parse_args()
 
+    if args.near_dup and args.ndjson:
+        parser.error('--near-dup needs the full entry set; run knowledge_dedup.py on the NDJSON output instead')
+    for name in {args.parser, args.verify_parser} - {None}:
+        if not parser_available(name):
+            parser.error(f'parser {name!r} is not installed (pip install {name})')
+
     roots = [Path(p) for p in args.source]
     files = find_html_files(roots)
-    print(f'Found {len(files)} html files to scan')
-
-    all_entries = []
-    for f in files:
-        entries = extract_from_html(f)
-        if entries:
-            all_entries.extend(entries)
-
-    # deduplicate by symptom_key + diagnosis
-    seen = set()
-    unique = []
-    for e in all_entries:
-        key = (e['symptom_key'], e['diagnosis'])
-        if key in seen: continue
-        seen.add(key)
-        unique.append(e)
-
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(unique, indent=2, ensure_ascii=False), encoding='utf-8')
-    print(f'Wrote {len(unique)} entries to {out_path}')
+    if args.verify_parser:
+        result = verify_parser(files, args.verify_parser, lambda f: decode_html(f.read_bytes()), extract_from_markup)
+        ref_s, cand_s = result['seconds'][DEFAULT_PARSER], result['seconds'][args.verify_parser]
+        print(f"{args.verify_parser} vs {DEFAULT_PARSER} over {result['files']} files: "
+              f"{cand_s:.1f}s vs {ref_s:.1f}s ({ref_s / max(cand_s, 1e-9):.2f}x), {len(result['differing'])} files with different output")
+        for path in result['differing'][:20]:
+            print(f'    {path}')
+        sys.exit(1 if result['differing'] else 0)
+    jobs = args.jobs or os.cpu_count() or 1
+    print(f'Found {len(files)} html files to scan ({jobs} job{"s" if jobs > 1 else ""})')
+
+    cache = ExtractCache(args.cache, 'extract_knowledge', f'{EXTRACTOR_VERSION}/{args.parser}') if args.cache else None
+    started = time.perf_counter()
+    batches = iter_extracted(files, jobs, cache, args.parser)
+    if args.ndjson:
+        out_path = Path(args.ndjson)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        seen = DiskKeySet(args.dedup_db)
+        written = 0
+        # Line buffering: every entry is visible to readers as soon as it is written
+        with out_path.open('w', encoding='utf-8', buffering=1) as out:
+            for e in dedupe_entries(batches, seen):
+                out.write(json.dumps(e, ensure_ascii=False) + '\n')
+                written += 1
+        seen.close()
+    else:
+        unique = list(dedupe_entries(batches))
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        if args.near_dup:
+            exact = len(unique)
+            unique, clusters = near_dedupe(unique, args.near_dup_threshold)
+            report_path = out_path.with_suffix('.clusters.json')
+            report_path.write_text(json.dumps(clusters, indent=2, ensure_ascii=False), encoding='utf-8')
+            print(f'Near-duplicates: {exact} -> {len(unique)} entries ({len(clusters)} clusters, report in {report_path})')
+        out_path.write_text(json.dumps(unique, indent=2, ensure_ascii=False), encoding='utf-8')
+        written = len(unique)
+    elapsed = time.perf_counter() - started
+    pruned = 0
+    if cache is not None:
+        # Drop entries of deleted/renamed files under the scanned roots so the cache does not grow forever
+        pruned = cache.prune(files, roots)
+        cache.close()
+    print(f'Wrote {written} entries to {out_path} ({elapsed:.1f}s)')
+    if args.stats:
+        print(f'{cache.stats_line()}, {pruned} stale entries pruned' if cache is not None else f'cache: disabled, parsed {len(files)} files')
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+extractor_benchmark.py
+
+Timing and output check of the HTML extractors' single-pass cores against the
+original multi-pass implementations, which live here only as the reference.
+Writes nothing.
+
+Usage:
+    python scripts/extractor_benchmark.py knowledge                  # every file under docs/ and public/
+    python scripts/extractor_benchmark.py knowledge --source docs --limit 200
+    python scripts/extractor_benchmark.py encyclopedia --root docs
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+import extract_component_encyclopedia as encyclopedia
+from extract_knowledge import decode_html, extract_from_soup, find_html_files, normalize_severity
+
+
+# ==========================================
+# 1. REFERENCE IMPLEMENTATIONS
+# ==========================================
+def legacy_knowledge_from_soup(soup: BeautifulSoup, path: Path) -> List[Dict]:
+    """Original three-pass implementation of extract_knowledge.extract_from_soup."""
+    results = []
+
+    # Collect text blocks that look promising
+    text = soup.get_text(separator='\n')
+
+    # Heuristic patterns and label synonyms
+    patterns = [r"Symptom[:\s]+(.+)", r"Diagnosis[:\s]+(.+)", r"Recommended action[:\s]+(.+)", r"Recommended[:\s]+(.+)", r"Severity[:\s]+(.+)"]
+    LABEL_SYNONYMS = {
+        'issue': 'symptom',
+        'observation': 'symptom',
+        'finding': 'symptom',
+        'sign': 'symptom',
+        'cause': 'actual_cause',
+        'root cause': 'actual_cause',
+        'remedy': 'recommended_action',
+        'resolution': 'recommended_action',
+        'fix': 'recommended_action',
+        'action': 'recommended_action'
+    }
+
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+
+    # Attempt sliding window to capture groups: symptom -> diagnosis -> recommended
+    for i, line in enumerate(lines):
+        m_sym = re.search(patterns[0], line, re.IGNORECASE)
+        if m_sym:
+            symptom = m_sym.group(1).strip()
+            diagnosis = ''
+            recommended = ''
+            severity = None
+            # look ahead up to 8 lines
+            for j in range(i+1, min(i+8, len(lines))):
+                nxt = lines[j]
+                m_diag = re.search(patterns[1], nxt, re.IGNORECASE)
+                if m_diag and not diagnosis:
+                    diagnosis = m_diag.group(1).strip()
+                    continue
+                m_rec = re.search(patterns[2], nxt, re.IGNORECASE) or re.search(patterns[3], nxt, re.IGNORECASE)
+                if m_rec and not recommended:
+                    recommended = m_rec.group(1).strip()
+                    continue
+                m_sev = re.search(patterns[4], nxt, re.IGNORECASE)
+                if m_sev and not severity:
+                    severity = normalize_severity(m_sev.group(1))
+                # try to match label synonyms like 'Issue:', 'Resolution:'
+                m_label = re.match(r'^(\w[\w\s]{1,40})[:\s]+(.+)', nxt)
+                if m_label:
+                    label = m_label.group(1).strip().lower()
+                    val = m_label.group(2).strip()
+                    mapped = LABEL_SYNONYMS.get(label)
+                    if mapped == 'symptom' and not symptom:
+                        symptom = val
+                    if mapped == 'recommended_action' and not recommended:
+                        recommended = val
+                    if mapped == 'actual_cause' and not diagnosis:
+                        diagnosis = val
+                    continue
+            results.append({
+                'symptom_key': symptom.upper().replace(' ', '_'),
+                'diagnosis': diagnosis or '',
+                'recommended_action': recommended or '',
+                'severity': severity or 'MEDIUM',
+                'source_file': str(path)
+            })
+
+    # Heuristic 2: look for structured blocks: <h*>Symptom</h*> followed by <p>
+    for header in soup.find_all(re.compile('^h[1-6]$', re.I)):
+        htext = header.get_text().strip().lower()
+        if 'symptom' in htext:
+            symptom = ''
+            diagnosis = ''
+            recommended = ''
+            severity = None
+            # symptom could be in the next sibling paragraph
+            sib = header.find_next_sibling()
+            if sib:
+                symptom = sib.get_text().strip()
+            # find next elements for diagnosis/recommended
+            for n in header.find_all_next(limit=12):
+                nt = n.get_text().strip()
+                low = nt.lower()
+                if not diagnosis and 'diagnosis' in low:
+                    diagnosis = nt.split(':',1)[-1].strip() if ':' in nt else ''
+                if not recommended and ('recommended' in low or 'action' in low or 'resolution' in low or 'remedy' in low or 'fix' in low):
+                    recommended = nt.split(':',1)[-1].strip() if ':' in nt else ''
+                if not severity and 'severity' in low:
+                    severity = normalize_severity(nt.split(':',1)[-1].strip() if ':' in nt else nt)
+                # catch synonyms like 'Issue' or 'Observation'
+                for syn, kind in LABEL_SYNONYMS.items():
+                    if syn in low:
+                        if kind == 'symptom' and not symptom:
+                            symptom = nt.split(':',1)[-1].strip() if ':' in nt else nt
+                        if kind == 'recommended_action' and not recommended:
+                            recommended = nt.split(':',1)[-1].strip() if ':' in nt else nt
+                        if kind == 'actual_cause' and not diagnosis:
+                            diagnosis = nt.split(':',1)[-1].strip() if ':' in nt else nt
+                if symptom and diagnosis and recommended:
+                    break
+            if symptom:
+                results.append({
+                    'symptom_key': symptom.upper().replace(' ', '_')[:60],
+                    'diagnosis': diagnosis,
+                    'recommended_action': recommended,
+                    'severity': severity or 'MEDIUM',
+                    'source_file': str(path)
+                })
+
+    # Heuristic 3: pattern-matching paragraphs for trio
+    para_texts = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
+    for p in para_texts:
+        # if contains the words symptom and diagnosis and recommended (or synonyms)
+        if re.search(r'symptom', p, re.I) or re.search(r'issue', p, re.I) or re.search(r'observation', p, re.I):
+            # try to extract fields
+            symptom = ''
+            diagnosis = ''
+            recommended = ''
+            m_sym = re.search(r'Symptom[:\s]+([^\n\r;]+)', p, re.I)
+            m_diag = re.search(r'Diagnosis[:\s]+([^\n\r;]+)', p, re.I)
+            m_rec = re.search(r'(Recommended action|Recommended)[:\s]+([^\n\r;]+)', p, re.I)
+            # additional patterns
+            if not m_sym:
+                m_sym = re.search(r'(Issue|Observation|Finding)[:\s]+([^\n\r;]+)', p, re.I)
+            if not m_rec:
+                m_rec = re.search(r'(Resolution|Remedy|Fix|Action)[:\s]+([^\n\r;]+)', p, re.I)
+            if m_sym:
+                # group 2 may exist for the alternative patterns
+                symptom = (m_sym.group(2) if m_sym.lastindex and m_sym.lastindex >= 2 else m_sym.group(1)).strip()
+            if m_diag:
+                diagnosis = m_diag.group(1).strip()
+            if m_rec:
+                recommended = m_rec.group(2).strip()
+            if symptom:
+                results.append({
+                    'symptom_key': symptom.upper().replace(' ', '_')[:60],
+                    'diagnosis': diagnosis,
+                    'recommended_action': recommended,
+                    'severity': 'MEDIUM',
+                    'source_file': str(path)
+                })
+
+    return results
+
+
+def legacy_encyclopedia_from_soup(soup, path=None):
+    """Original find_next_siblings() implementation of extract_component_encyclopedia.extract_from_soup."""
+    candidates = []
+    # find headings
+    for h in soup.find_all(re.compile('^h[1-6]$')):
+        htext = h.get_text(separator=' ').strip()
+        if re.search(r'\b(Definition|Function|Purpose|Description)\b', htext, re.I):
+            # grab following siblings paragraphs
+            desc = []
+            for sib in h.find_next_siblings():
+                if sib.name and re.match('^h[1-6]$', sib.name):
+                    break
+                if sib.name == 'p':
+                    desc.append(sib.get_text(separator=' ').strip())
+            if desc:
+                candidates.append((htext, '\n\n'.join(desc)))
+    # fallback: look for <p> with leading 'Definition:' or 'Function:'
+    for p in soup.find_all('p'):
+        ptext = p.get_text(separator=' ').strip()
+        m = re.match(r'^(Definition|Function|Purpose):\s*(.+)', ptext, re.I)
+        if m:
+            candidates.append((m.group(1), m.group(2)))
+    return candidates
+
+
+# ==========================================
+# 2. BENCHMARK
+# ==========================================
+def run_benchmark(files: List[Path], reference, candidate, read=lambda f: decode_html(f.read_bytes())) -> Dict:
+    """
+    Times parsing and both heuristic implementations on every file and checks
+    that the candidate returns exactly what the reference returns.
+
+    :param reference: (soup, path) -> extracted records, original implementation
+    :param candidate: (soup, path) -> extracted records, single-pass core
+    :param read: path -> markup (not timed)
+    """
+    parse_s = legacy_s = single_s = 0.0
+    mismatches = []
+    for f in files:
+        html = read(f)
+        t0 = time.perf_counter()
+        soup = BeautifulSoup(html, 'html.parser')
+        t1 = time.perf_counter()
+        expected = reference(soup, f)
+        t2 = time.perf_counter()
+        got = candidate(soup, f)
+        t3 = time.perf_counter()
+        parse_s += t1 - t0
+        legacy_s += t2 - t1
+        single_s += t3 - t2
+        if got != expected:
+            mismatches.append(str(f))
+    n = max(len(files), 1)
+    return {
+        'files': len(files),
+        'parse_ms': parse_s / n * 1000,
+        'legacy_ms': legacy_s / n * 1000,
+        'single_pass_ms': single_s / n * 1000,
+        'mismatches': mismatches,
+    }
+
+
+def print_benchmark(bench: Dict):
+    legacy_total = bench['parse_ms'] + bench['legacy_ms']
+    single_total = bench['parse_ms'] + bench['single_pass_ms']
+    print(f"Benchmark over {bench['files']} files (mean per file):")
+    print(f"  parse (html.parser)    {bench['parse_ms']:8.2f} ms")
+    print(f"  heuristics, reference  {bench['legacy_ms']:8.2f} ms")
+    print(f"  heuristics, 1-pass     {bench['single_pass_ms']:8.2f} ms  ({bench['legacy_ms'] / max(bench['single_pass_ms'], 1e-9):.1f}x)")
+    print(f"  end to end             {legacy_total:8.2f} -> {single_total:.2f} ms  ({legacy_total / max(single_total, 1e-9):.2f}x)")
+    print(f"  output mismatches      {len(bench['mismatches'])}")
+    for path in bench['mismatches'][:20]:
+        print(f'    {path}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-pass extractor cores vs. their reference implementations')
+    sub = parser.add_subparsers(dest='extractor', required=True)
+    knowledge = sub.add_parser('knowledge', help='extract_knowledge.py')
+    knowledge.add_argument('--source', nargs='+', default=['docs', 'public'], help='Source directories to scan')
+    knowledge.add_argument('--limit', type=int, default=0, help='Only the first N files (0 = all)')
+    component = sub.add_parser('encyclopedia', help='extract_component_encyclopedia.py')
+    component.add_argument('--root', default='docs', help='root folder to scan (default: docs)')
+    component.add_argument('--limit', type=int, default=0, help='Only the first N files (0 = all)')
+    args = parser.parse_args()
+
+    if args.extractor == 'knowledge':
+        files = find_html_files([Path(p) for p in args.source])
+        bench_args = (legacy_knowledge_from_soup, extract_from_soup)
+    else:
+        files = [Path(p) for p in encyclopedia.iter_html_files(args.root)]
+        bench_args = (legacy_encyclopedia_from_soup, lambda soup, path: encyclopedia.extract_from_soup(soup),
+                      lambda path: encyclopedia.read_html(path)[0])
+    if args.limit:
+        files = files[:args.limit]
+    bench = run_benchmark(files, *bench_args)
+    print_benchmark(bench)
+    sys.exit(1 if bench['mismatches'] else 0)
+
+
+if __name__ == '__main__':
+    main()
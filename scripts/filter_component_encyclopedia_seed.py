@@ -1,33 +1,55 @@
 #!/usr/bin/env python3
 """Filter component_encyclopedia_seed.csv to remove rows with short descriptions (<50 chars).
 Writes filtered CSV to scripts/component_encyclopedia_seed.filtered.csv
+
+Usage:
+  python scripts/filter_component_encyclopedia_seed.py
+  python scripts/filter_component_encyclopedia_seed.py --in seed.csv --out seed.filtered.csv --min-chars 80
+
+filter_rows() is also used as a stage of component_encyclopedia_pipeline.py.
 """
+import argparse
 import csv
 from pathlib import Path
 
 IN = Path(__file__).parent / 'component_encyclopedia_seed.csv'
 OUT = Path(__file__).parent / 'component_encyclopedia_seed.filtered.csv'
+MIN_CHARS = 50
+
 
-if not IN.exists():
-    print(f"Input CSV not found: {IN}")
-    raise SystemExit(1)
-
-rows = []
-with IN.open(newline='', encoding='utf-8') as f:
-    reader = csv.DictReader(f)
-    for r in reader:
-        desc = (r.get('description') or '').strip()
-        if len(desc) >= 50:
-            rows.append(r)
-
-if not rows:
-    print('No rows passed the filter (>=50 chars). Aborting write.')
-    raise SystemExit(2)
-
-with OUT.open('w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-    writer.writeheader()
+def filter_rows(rows, min_chars=MIN_CHARS):
+    """Yields the rows whose stripped description has at least min_chars characters."""
     for r in rows:
-        writer.writerow(r)
+        if len((r.get('description') or '').strip()) >= min_chars:
+            yield r
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drop component encyclopedia rows with short descriptions')
+    parser.add_argument('--in', dest='input', type=Path, default=IN)
+    parser.add_argument('--out', dest='output', type=Path, default=OUT)
+    parser.add_argument('--min-chars', type=int, default=MIN_CHARS)
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Input CSV not found: {args.input}")
+        raise SystemExit(1)
+
+    with args.input.open(newline='', encoding='utf-8') as f:
+        rows = list(filter_rows(csv.DictReader(f), args.min_chars))
+
+    if not rows:
+        print(f'No rows passed the filter (>={args.min_chars} chars). Aborting write.')
+        raise SystemExit(2)
+
+    with args.output.open('w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        for r in rows:
+            writer.writerow(r)
+
+    print(f'Wrote {len(rows)} rows to {args.output}')
+
 
-print(f'Wrote {len(rows)} rows to {OUT}')
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,29 @@
 """
 Generate SQL upsert statements from the CSV seed produced by extract_component_encyclopedia.py
 
+Rows are streamed from the CSV to the SQL file, so memory stays constant for any
+seed size. With the default --batch-size 1 the output is byte-identical to the
+historical one-statement-per-row file; larger batches emit multi-row INSERTs.
+Output only depends on the input and --batch-size (never on --jobs), so diffs of
+the seed SQL stay reviewable.
+
 Usage:
   python scripts/generate_component_encyclopedia_sql.py --in scripts/component_encyclopedia_seed.csv --out scripts/component_encyclopedia_seed.sql
+  python scripts/generate_component_encyclopedia_sql.py --in big_seed.csv --out big_seed.sql --batch-size 500 --jobs 4
 """
 import argparse
 import csv
 import json
 import html
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+INSERT_HEAD = "INSERT INTO public.component_encyclopedia (component_name, description, physics_principle, common_failure_modes) VALUES "
+UPSERT_TAIL = "ON CONFLICT (component_name) DO UPDATE SET description = EXCLUDED.description, physics_principle = EXCLUDED.physics_principle, common_failure_modes = EXCLUDED.common_failure_modes, updated_at = now();\n"
+
+CHUNK_ROWS = 2000  # rows rendered per worker task in --jobs mode
+PENDING_PER_JOB = 4
 
 
 def esc(s: str) -> str:
@@ -17,42 +33,108 @@ def esc(s: str) -> str:
     return s.replace("'", "''")
 
 
+def failure_modes_json(value):
+    """Valid JSON is kept as is; anything else is wrapped as a single-element array with the raw string."""
+    common = value or '[]'
+    try:
+        json.loads(common)
+        return common
+    except Exception:
+        return json.dumps([common])
+
+
+def values_sql(r) -> str:
+    return "('%s','%s','%s',%s)" % (
+        esc(r.get('component_name', '')),
+        esc(r.get('description', '')),
+        esc(r.get('physics_principle', '')),
+        f"'{esc(failure_modes_json(r.get('common_failure_modes', '')))}'::jsonb",
+    )
+
+
+def render_batch(rows) -> str:
+    """
+    One upsert statement for a batch of CSV rows.
+
+    Postgres rejects an ON CONFLICT DO UPDATE that touches the same row twice,
+    so only the last row per component_name of the batch is kept (the same
+    final state as applying the rows one by one).
+    """
+    if len(rows) > 1:
+        last = {r.get('component_name', ''): r for r in rows}
+        rows = [r for r in rows if last[r.get('component_name', '')] is r]
+    if len(rows) == 1:
+        return INSERT_HEAD + values_sql(rows[0]) + ' ' + UPSERT_TAIL
+    return INSERT_HEAD + '\n' + ',\n'.join(values_sql(r) for r in rows) + '\n' + UPSERT_TAIL
+
+
+def render_batches(batches):
+    """Worker task: (sql text, rows, statements) for a list of batches."""
+    return ''.join(render_batch(b) for b in batches), sum(len(b) for b in batches), len(batches)
+
+
+def iter_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+
+def _batched(items, size):
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_sql(rows, batch_size=1, jobs=1):
+    """
+    Yields (sql text, rows, statements) in input order.
+
+    Batches are cut in the parent process, so the output does not depend on
+    jobs; with jobs > 1 groups of batches are rendered in worker processes and
+    at most PENDING_PER_JOB * jobs groups are in flight.
+    """
+    batches = _batched(rows, batch_size)
+    if jobs <= 1:
+        for batch in batches:
+            yield render_batch(batch), len(batch), 1
+        return
+    groups = _batched(batches, max(CHUNK_ROWS // batch_size, 1))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for group in groups:
+            pending.append(pool.submit(render_batches, group))
+            if len(pending) > PENDING_PER_JOB * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--in', dest='input', required=True)
     parser.add_argument('--out', dest='output', required=True)
+    parser.add_argument('--batch-size', type=int, default=1, help='Rows per INSERT statement (1 = one statement per row)')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes rendering chunks of batches')
     args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error('--batch-size must be >= 1')
 
-    rows = []
-    with open(args.input, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for r in reader:
-            rows.append(r)
-
+    n_rows = n_statements = 0
     with open(args.output, 'w', encoding='utf-8') as out:
         out.write('-- Generated upsert SQL for component_encyclopedia\n')
         out.write('BEGIN;\n')
-        for r in rows:
-            cname = esc(r.get('component_name',''))
-            desc = esc(r.get('description',''))
-            physics = esc(r.get('physics_principle',''))
-            common = r.get('common_failure_modes','') or '[]'
-            # ensure common is valid JSON string literal
-            try:
-                json.loads(common)
-                common_sql = f"'{esc(common)}'::jsonb"
-            except Exception:
-                # fallback: wrap as single-element array with the raw string
-                common_sql = f"'{esc(json.dumps([common]))}'::jsonb"
-
-            stmt = (
-                "INSERT INTO public.component_encyclopedia (component_name, description, physics_principle, common_failure_modes) VALUES ('%s','%s','%s',%s) "
-                "ON CONFLICT (component_name) DO UPDATE SET description = EXCLUDED.description, physics_principle = EXCLUDED.physics_principle, common_failure_modes = EXCLUDED.common_failure_modes, updated_at = now();\n"
-            ) % (cname, desc, physics, common_sql)
-            out.write(stmt)
+        for text, rows, statements in iter_sql(iter_rows(args.input), args.batch_size, args.jobs):
+            out.write(text)
+            n_rows += rows
+            n_statements += statements
         out.write('COMMIT;\n')
 
-    print(f'Wrote {len(rows)} upsert statements to {args.output}')
+    if n_statements == n_rows:
+        print(f'Wrote {n_rows} upsert statements to {args.output}')
+    else:
+        print(f'Wrote {n_rows} rows as {n_statements} upsert statements to {args.output}')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+guard_scheduler.py
+
+Event-driven scheduler for the guard rules in intelligence_guard.py and
+hydraulic_integrity.py.
+
+Instead of re-running every rule for every unit on every tick, callers push
+input changes (status transitions, lubrication cycles, temperature samples,
+pressure gradients). Each rule declares the inputs it reads; only the
+(unit, rule) pairs touched since the last run are re-evaluated, and
+subscribers are notified when a rule's verdict changes. CPU cost therefore
+follows the event rate, not fleet size x rule count.
+
+Usage:
+    python scripts/guard_scheduler.py   # runs the fleet simulation below
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Set, Tuple
+
+import numpy as np
+
+from hydraulic_integrity import HydraulicSafetyVerify
+from intelligence_guard import IntelligenceGuard, RingTempTrend, TurbineStatus
+
+
+@dataclass(frozen=True)
+class GuardRule:
+    name: str
+    inputs: FrozenSet[str]
+    evaluate: Callable[[Dict[str, Any]], Hashable]  # unit state -> verdict
+
+
+@dataclass(frozen=True)
+class StateChange:
+    unit_id: Hashable
+    rule: str
+    previous: Hashable  # None on first evaluation
+    current: Hashable
+
+
+# ==========================================
+# 1. DEFAULT RULES
+# ==========================================
+BEARING_RULE = GuardRule(
+    name="bearing_integrity",
+    inputs=frozenset({"status", "lubrication_cycles", "temp_trend"}),
+    evaluate=lambda s: IntelligenceGuard.check_bearing_integrity(s["status"], s["lubrication_cycles"], s["temp_trend"]),
+)
+
+HYDRAULIC_RULE = GuardRule(
+    name="hydraulic_integrity",
+    inputs=frozenset({"designed_diameter_mm", "field_modified_diameter_mm", "pressure_gradient"}),
+    evaluate=lambda s: HydraulicSafetyVerify.check_hydraulic_integrity(
+        s["designed_diameter_mm"], s["field_modified_diameter_mm"], s["pressure_gradient"]
+    )["status"],
+)
+
+DEFAULT_RULES = (BEARING_RULE, HYDRAULIC_RULE)
+
+
+# ==========================================
+# 2. SCHEDULER
+# ==========================================
+class GuardScheduler:
+    """
+    Tracks per-unit inputs and re-evaluates only rules whose inputs changed.
+
+    A rule is evaluated for a unit once all of its inputs are known.
+    Units start with lubrication_cycles=0 and an empty RingTempTrend, so the
+    bearing rule only waits for a status.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, trend_capacity: int = 64):
+        self.trend_capacity = trend_capacity
+        self._rules: Dict[str, GuardRule] = {}
+        self._by_input: Dict[str, List[GuardRule]] = {}
+        self._state: Dict[Hashable, Dict[str, Any]] = {}
+        self._verdicts: Dict[Tuple[Hashable, str], Hashable] = {}
+        self._dirty: Dict[Hashable, Set[str]] = {}
+        self._subscribers: List[Callable[[StateChange], None]] = []
+        self.evaluations = 0
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule: GuardRule):
+        self._rules[rule.name] = rule
+        for key in rule.inputs:
+            self._by_input.setdefault(key, []).append(rule)
+        # Existing units may already satisfy the new rule
+        for unit_id in self._state:
+            self._dirty.setdefault(unit_id, set()).add(rule.name)
+
+    def subscribe(self, callback: Callable[[StateChange], None]):
+        self._subscribers.append(callback)
+
+    def _unit(self, unit_id) -> Dict[str, Any]:
+        state = self._state.get(unit_id)
+        if state is None:
+            state = {"lubrication_cycles": 0, "temp_trend": RingTempTrend(self.trend_capacity)}
+            self._state[unit_id] = state
+        return state
+
+    def _touch(self, unit_id, key: str):
+        rules = self._by_input.get(key)
+        if rules:
+            dirty = self._dirty.setdefault(unit_id, set())
+            for rule in rules:
+                dirty.add(rule.name)
+
+    def update(self, unit_id, **inputs):
+        """Sets inputs for a unit; rules are only marked dirty for values that actually changed."""
+        state = self._unit(unit_id)
+        for key, value in inputs.items():
+            if key in state and state[key] == value:
+                continue
+            state[key] = value
+            self._touch(unit_id, key)
+
+    def add_temp_sample(self, unit_id, value: float):
+        self._unit(unit_id)["temp_trend"].append(value)
+        self._touch(unit_id, "temp_trend")
+
+    def verdict(self, unit_id, rule: str):
+        return self._verdicts.get((unit_id, rule))
+
+    def run_pending(self) -> List[StateChange]:
+        """Evaluates dirty (unit, rule) pairs and publishes verdicts that changed."""
+        changes = []
+        dirty, self._dirty = self._dirty, {}
+        for unit_id, rule_names in dirty.items():
+            state = self._state[unit_id]
+            for name in rule_names:
+                rule = self._rules[name]
+                if not rule.inputs.issubset(state):
+                    continue
+                current = rule.evaluate(state)
+                self.evaluations += 1
+                key = (unit_id, name)
+                previous = self._verdicts.get(key)
+                if current != previous:
+                    self._verdicts[key] = current
+                    changes.append(StateChange(unit_id, name, previous, current))
+        for change in changes:
+            for callback in self._subscribers:
+                callback(change)
+        return changes
+
+
+# ==========================================
+# 3. FLEET SIMULATION
+# ==========================================
+if __name__ == "__main__":
+    rng = np.random.default_rng(3)
+    n_units, n_ticks, event_rate = 5_000, 200, 0.01
+
+    scheduler = GuardScheduler()
+    alarms = []
+    scheduler.subscribe(lambda change: alarms.append(change) if change.current not in ("STATUS_OK", "NORMAL") else None)
+
+    for unit in range(n_units):
+        scheduler.update(unit, status=TurbineStatus.RUNNING, designed_diameter_mm=12.0,
+                         field_modified_diameter_mm=12.0, pressure_gradient=5.0)
+        scheduler.add_temp_sample(unit, 55.0)
+    scheduler.run_pending()
+    scheduler.evaluations = 0
+
+    started = time.perf_counter()
+    for tick in range(n_ticks):
+        for unit in np.flatnonzero(rng.random(n_units) < event_rate).tolist():
+            kind = rng.integers(0, 4)
+            if kind == 0:
+                scheduler.update(unit, status=TurbineStatus(rng.choice([s.value for s in TurbineStatus])))
+            elif kind == 1:
+                scheduler.update(unit, lubrication_cycles=int(rng.integers(0, 9)))
+            elif kind == 2:
+                scheduler.add_temp_sample(unit, 55.0 + float(rng.normal(0.0, 3.0)))
+            else:
+                scheduler.update(unit, pressure_gradient=float(rng.gamma(2.0, 8.0)))
+        scheduler.run_pending()
+    elapsed = time.perf_counter() - started
+
+    polled = n_units * len(DEFAULT_RULES) * n_ticks
+    print(f"{n_units} units x {len(DEFAULT_RULES)} rules x {n_ticks} ticks, {event_rate:.0%} of units with an event per tick")
+    print(f"rule evaluations: {scheduler.evaluations} (full polling would run {polled})")
+    print(f"alarm transitions published: {len(alarms)} | wall time {elapsed * 1000:.0f} ms")
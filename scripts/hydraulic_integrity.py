@@ -1,4 +1,8 @@
 import json
+import time
+
+import numpy as np
+from scipy.signal import butter, lfilter, lfilter_zi
 
 # ==========================================
 # 1. STRUCTURED LEGACY INCIDENT (JSON)
@@ -29,16 +33,188 @@ legacy_incident_data = {
     }
 }
 
+# ==========================================
+# 1b. INCIDENT SIGNATURE REGISTRY
+# ==========================================
+SERVO_PRESSURE_SENSOR = "PRESSURE_TRANSDUCER_SERVO"
+
+
+class IncidentSignatureRegistry:
+    """
+    Catalog of legacy incident signatures, indexed by sensor_type and trigger threshold.
+
+    Per sensor type the thresholds are kept in one sorted array, so the set of
+    incidents matched by a gradient g (threshold < g) is always a prefix of that
+    array and is found with one binary search, no matter how many incidents
+    are registered.
+    """
+
+    def __init__(self, incidents=()):
+        self._pending = {}  # sensor_type -> [(threshold, incident)], unsorted
+        self._index = {}    # sensor_type -> (sorted thresholds ndarray, incidents in the same order)
+        for incident in incidents:
+            self.add(incident)
+
+    def add(self, incident: dict):
+        signature = incident["pattern_matching_signature"]
+        sensor_type = signature["sensor_type"]
+        self._pending.setdefault(sensor_type, []).append((float(signature["trigger_gradient_bar_per_sec"]), incident))
+        self._index.pop(sensor_type, None)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._pending.values())
+
+    @classmethod
+    def from_json(cls, path: str) -> "IncidentSignatureRegistry":
+        """Loads a JSON file holding one incident dict or a list of them (legacy_incident_data shape)."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data if isinstance(data, list) else [data])
+
+    @classmethod
+    def from_db(cls, bind) -> "IncidentSignatureRegistry":
+        """
+        Loads db_init.LegacyIncident rows whose `symptoms` JSON carries a
+        "pattern_matching_signature" object. Rows without one are skipped.
+        """
+        from sqlalchemy import select
+        from db_init import LegacyIncident
+
+        registry = cls()
+        t = LegacyIncident.__table__
+        with bind.connect() as conn:
+            for code, incident_type, symptoms in conn.execute(select(t.c.code, t.c.incident_type, t.c.symptoms)):
+                if isinstance(symptoms, dict) and "pattern_matching_signature" in symptoms:
+                    registry.add({
+                        "incident_id": code,
+                        "incident_type": incident_type,
+                        "pattern_matching_signature": symptoms["pattern_matching_signature"],
+                    })
+        return registry
+
+    def _entries(self, sensor_type: str):
+        entry = self._index.get(sensor_type)
+        if entry is None:
+            pairs = sorted(self._pending.get(sensor_type, []), key=lambda p: p[0])
+            entry = (np.array([p[0] for p in pairs], dtype=float), [p[1] for p in pairs])
+            self._index[sensor_type] = entry
+        return entry
+
+    def thresholds(self, sensor_type: str) -> np.ndarray:
+        return self._entries(sensor_type)[0]
+
+    def incidents(self, sensor_type: str) -> list:
+        """Incidents for one sensor type, ordered by ascending trigger threshold."""
+        return self._entries(sensor_type)[1]
+
+    def min_threshold(self, sensor_type: str) -> float:
+        thresholds = self.thresholds(sensor_type)
+        return float(thresholds[0]) if thresholds.size else float("inf")
+
+    def match_counts(self, sensor_type: str, gradient) -> np.ndarray:
+        """
+        Number of signatures matched per gradient value; matches are incidents(sensor_type)[:count].
+        NaN gradients match nothing (searchsorted would sort them past every
+        threshold); +inf still exceeds every threshold, as `gradient > threshold` does.
+        """
+        g = np.asarray(gradient, dtype=float)
+        counts = np.searchsorted(self.thresholds(sensor_type), g, side="left")
+        return np.where(np.isnan(g), 0, counts)
+
+    def match(self, sensor_type: str, gradient: float) -> list:
+        """Incidents whose trigger gradient is exceeded by `gradient`."""
+        return self.incidents(sensor_type)[:int(self.match_counts(sensor_type, gradient))]
+
+
+DEFAULT_REGISTRY = IncidentSignatureRegistry([legacy_incident_data])
+
 # ==========================================
 # 2. PYTHON SAFETY LOGIC
 # ==========================================
+# Integer codes used by the batch API; index = code
+STATUS_CODES = ("NORMAL", "CRITICAL_ALARM", "EMERGENCY")
+ACTION_CODES = ("NONE", "LOCKOUIT_PREVENT_STARTUP", "INITIATE_SAFE_SHUTDOWN_SEQUENCE")
+STATUS_NORMAL, STATUS_CRITICAL_ALARM, STATUS_EMERGENCY = 0, 1, 2
+
+MAX_DIAMETER_VARIANCE_PERCENT = 15.0
+
+
 class HydraulicSafetyVerify:
-    
+
+    @staticmethod
+    def _build_warnings(designed_diameter_mm, field_modified_diameter_mm, variance_percent, current_pressure_gradient, config_alarm, matched_incidents) -> list:
+        """Formats the warning text for one alarming row."""
+        warnings = []
+        if config_alarm:
+            warnings.append(
+                f"UNAUTHORIZED HYDRAULIC MODIFICATION: Diameter {field_modified_diameter_mm}mm deviates {variance_percent:.1f}% from design ({designed_diameter_mm}mm). Max allowed 15%."
+            )
+            # Physics Context addition based on known legacy issue
+            if field_modified_diameter_mm > designed_diameter_mm:
+                warnings.append("Physics Note: Larger diameter reduces damping, increasing Water Hammer risk!")
+        if matched_incidents:
+            # The highest exceeded threshold is the closest match; list the rest by id
+            ids = [incident["incident_id"] for incident in reversed(matched_incidents)]
+            label = ids[0] if len(ids) == 1 else f"{ids[0]} (also exceeds {', '.join(ids[1:])})"
+            warnings.append(
+                f"LEGACY PATTERN DETECTED: Pressure spike {current_pressure_gradient} bar/s matches historical incident {label}."
+            )
+        return warnings
+
+    @staticmethod
+    def check_hydraulic_integrity_batch(designed_diameter_mm, field_modified_diameter_mm, current_pressure_gradient, with_warnings: bool = True, registry: IncidentSignatureRegistry = None) -> dict:
+        """
+        Vectorized hydraulic safety check over many (design, field, dP/dt) rows.
+
+        Inputs are array-likes (or scalars) broadcast against each other.
+        Gradients are matched against the servo-pressure signatures of
+        `registry` (DEFAULT_REGISTRY = LEG-HYD-001 only).
+
+        :return: {
+            "status": uint8 array of STATUS_CODES indices,
+            "action": uint8 array of ACTION_CODES indices,
+            "variance_percent": float array,
+            "warnings": {row_index: [str, ...]} for alarming rows only
+        }
+        """
+        designed, field, gradient = np.broadcast_arrays(
+            np.asarray(designed_diameter_mm, dtype=float),
+            np.asarray(field_modified_diameter_mm, dtype=float),
+            np.asarray(current_pressure_gradient, dtype=float),
+        )
+        designed, field, gradient = designed.ravel(), field.ravel(), gradient.ravel()
+
+        # --- CHECK 1: CONFIGURATION INTEGRITY (The 15% Rule) ---
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = np.abs(field - designed) / designed * 100
+        config_alarm = variance > MAX_DIAMETER_VARIANCE_PERCENT
+
+        # --- CHECK 2: REAL-TIME PATTERN MATCHING (The 'Ghost' Trigger) ---
+        if registry is None:
+            registry = DEFAULT_REGISTRY
+        match_counts = registry.match_counts(SERVO_PRESSURE_SENSOR, gradient)
+        pattern_alarm = match_counts > 0
+
+        # EMERGENCY overrides CRITICAL_ALARM, as in the sequential checks
+        status = np.where(pattern_alarm, STATUS_EMERGENCY, np.where(config_alarm, STATUS_CRITICAL_ALARM, STATUS_NORMAL)).astype(np.uint8)
+        action = status.copy()  # action codes line up with status codes
+
+        warnings = {}
+        if with_warnings:
+            for i in np.flatnonzero(status).tolist():
+                warnings[i] = HydraulicSafetyVerify._build_warnings(
+                    designed[i].item(), field[i].item(), variance[i].item(), gradient[i].item(),
+                    bool(config_alarm[i]), registry.incidents(SERVO_PRESSURE_SENSOR)[:int(match_counts[i])],
+                )
+
+        return {"status": status, "action": action, "variance_percent": variance, "warnings": warnings}
+
     @staticmethod
     def check_hydraulic_integrity(
         designed_diameter_mm: float, 
         field_modified_diameter_mm: float, 
-        current_pressure_gradient: float
+        current_pressure_gradient: float,
+        registry: IncidentSignatureRegistry = None
     ) -> dict:
         """
         Evaluates hydraulic safety based on design compliance and real-time sensor patterns.
@@ -46,45 +222,149 @@ class HydraulicSafetyVerify:
         :param designed_diameter_mm: The specification from Project Genesis (e.g., 12mm)
         :param field_modified_diameter_mm: The actual measured/input diameter on site
         :param current_pressure_gradient: Real-time dP/dt from sensors (bar/s)
+        :param registry: Legacy incident signatures to match (defaults to LEG-HYD-001)
         :return: Safety Assessment Dictionary
         """
-        
-        result = {
-            "status": "NORMAL",
-            "warnings": [],
-            "action": "NONE"
+        if registry is None:
+            registry = DEFAULT_REGISTRY
+        batch = HydraulicSafetyVerify.check_hydraulic_integrity_batch(
+            designed_diameter_mm, field_modified_diameter_mm, current_pressure_gradient, with_warnings=False, registry=registry
+        )
+        status = int(batch["status"][0])
+        warnings = []
+        if status != STATUS_NORMAL:
+            # Format from the caller's own values so the text matches what they passed in
+            warnings = HydraulicSafetyVerify._build_warnings(
+                designed_diameter_mm, field_modified_diameter_mm, float(batch["variance_percent"][0]), current_pressure_gradient,
+                batch["variance_percent"][0] > MAX_DIAMETER_VARIANCE_PERCENT,
+                registry.match(SERVO_PRESSURE_SENSOR, current_pressure_gradient),
+            )
+
+        return {
+            "status": STATUS_CODES[status],
+            "warnings": warnings,
+            "action": ACTION_CODES[int(batch["action"][0])]
         }
 
-        # --- CHECK 1: CONFIGURATION INTEGRITY (The 15% Rule) ---
-        deviation = abs(field_modified_diameter_mm - designed_diameter_mm)
-        variance_percent = (deviation / designed_diameter_mm) * 100
-        
-        if variance_percent > 15.0:
-            result["status"] = "CRITICAL_ALARM"
-            result["warnings"].append(
-                f"UNAUTHORIZED HYDRAULIC MODIFICATION: Diameter {field_modified_diameter_mm}mm deviates {variance_percent:.1f}% from design ({designed_diameter_mm}mm). Max allowed 15%."
-            )
-            result["action"] = "LOCKOUIT_PREVENT_STARTUP"
-            
-            # Physics Context addition based on known legacy issue
-            if field_modified_diameter_mm > designed_diameter_mm:
-                 result["warnings"].append("Physics Note: Larger diameter reduces damping, increasing Water Hammer risk!")
+# ==========================================
+# 3. STREAMING dP/dt DETECTOR
+# ==========================================
+class PressureGradientDetector:
+    """
+    Derives dP/dt from raw servo pressure samples and matches it against the
+    legacy incident signatures of one sensor type, one channel per instance.
 
-        # --- CHECK 2: REAL-TIME PATTERN MATCHING (The 'Ghost' Trigger) ---
-        # Using the signature from our structured JSON
-        incident_trigger_gradient = legacy_incident_data["pattern_matching_signature"]["trigger_gradient_bar_per_sec"]
-        
-        if current_pressure_gradient > incident_trigger_gradient:
-            result["status"] = "EMERGENCY"
-            result["warnings"].append(
-                f"LEGACY PATTERN DETECTED: Pressure spike {current_pressure_gradient} bar/s matches historical incident {legacy_incident_data['incident_id']}."
-            )
-            result["action"] = "INITIATE_SAFE_SHUTDOWN_SEQUENCE"
+    Pressure is low-pass filtered (2nd-order Butterworth) and differentiated in
+    a single IIR stage, so the only state carried between chunks is two filter
+    delays plus the alarm latch: O(1) memory per channel, and each chunk is one
+    vectorized lfilter call plus one searchsorted against the registry.
+    """
+
+    def __init__(self, sample_rate_hz: float, registry: IncidentSignatureRegistry = None, sensor_type: str = SERVO_PRESSURE_SENSOR, cutoff_hz: float = 10.0, rearm_fraction: float = 0.8, channel: str = None):
+        """
+        :param sample_rate_hz: Transducer sample rate (e.g. 1000 Hz)
+        :param registry: Signatures to match (defaults to LEG-HYD-001)
+        :param sensor_type: Which registry signatures apply to this channel
+        :param cutoff_hz: Low-pass corner applied before differentiation
+        :param rearm_fraction: The latch resets once dP/dt falls below this fraction of the lowest trigger
+        :param channel: Free-form channel label copied into events
+        """
+        if not 0 < cutoff_hz < sample_rate_hz / 2:
+            raise ValueError(f"cutoff_hz must be between 0 and Nyquist ({sample_rate_hz / 2} Hz)")
+        if registry is None:
+            registry = DEFAULT_REGISTRY
+        self.registry = registry
+        self.sensor_type = sensor_type
+        self.rearm_level = self.registry.min_threshold(sensor_type) * rearm_fraction
+        self.sample_rate_hz = float(sample_rate_hz)
+        self.channel = channel
+
+        b, a = butter(2, cutoff_hz / (sample_rate_hz / 2))
+        # Low-pass followed by backward difference, folded into one filter (output in bar/s)
+        self._b = np.convolve(b, [1.0, -1.0]) * self.sample_rate_hz
+        self._a = a
+        self._zi_unit = lfilter_zi(self._b, self._a)
+        self.reset()
+
+    def _hold_non_finite(self, x: np.ndarray):
+        """
+        Replaces NaN/inf samples (transducer dropouts) with the last finite
+        reading so the filter state stays finite. Returns None, after counting
+        the samples, while no finite reading has been seen yet.
+        """
+        finite = np.isfinite(x)
+        if finite.all():
+            self._last_finite = x[-1]
+            return x
+        if not finite.any():
+            if self._last_finite is None:
+                self.samples_seen += x.size
+                return None
+            return np.full(x.size, self._last_finite)
+        # Index of the latest finite sample at or before each position (-1 = none yet in this chunk)
+        last = np.maximum.accumulate(np.where(finite, np.arange(x.size), -1))
+        start = self._last_finite if self._last_finite is not None else x[finite][0]
+        held = np.where(last >= 0, x[np.maximum(last, 0)], start)
+        self._last_finite = held[-1]
+        return held
+
+    def reset(self):
+        self._zi = None
+        self._last_finite = None
+        self._latched = 0  # number of signatures already reported in the current excursion
+        self.samples_seen = 0
+        self.last_gradient = 0.0
+
+    def process(self, samples) -> list:
+        """
+        Consumes one chunk of raw pressure samples (bar) and returns one event
+        per signature whose trigger gradient is first exceeded inside it.
+        """
+        x = np.asarray(samples, dtype=float)
+        if x.size == 0:
+            return []
+        x = self._hold_non_finite(x)
+        if x is None:
+            return []
+        if self._zi is None:
+            # Start in steady state at the first reading so the stream does not open with a fake step
+            self._zi = self._zi_unit * x[0]
+        gradient, self._zi = lfilter(self._b, self._a, x, zi=self._zi)
+
+        levels = self.registry.match_counts(self.sensor_type, gradient)
+        rearm = gradient < self.rearm_level
+        # Only samples where the match level or the re-arm flag changes can alter the latch
+        changed = np.flatnonzero((levels[1:] != levels[:-1]) | (rearm[1:] != rearm[:-1])) + 1
+        incidents = self.registry.incidents(self.sensor_type)
+
+        events = []
+        for i in [0] + changed.tolist():
+            if self._latched and rearm[i]:
+                self._latched = 0
+            level = int(levels[i])
+            if level > self._latched:
+                index = self.samples_seen + i
+                for incident in incidents[self._latched:level]:
+                    signature = incident["pattern_matching_signature"]
+                    events.append({
+                        "incident_id": incident["incident_id"],
+                        "channel": self.channel,
+                        "sensor_type": self.sensor_type,
+                        "waveform_type": signature.get("waveform_type"),
+                        "trigger_gradient_bar_per_sec": signature["trigger_gradient_bar_per_sec"],
+                        "sample_index": index,
+                        "time_s": index / self.sample_rate_hz,
+                        "gradient_bar_per_sec": float(gradient[i]),
+                    })
+                self._latched = level
+
+        self.samples_seen += x.size
+        self.last_gradient = float(gradient[-1])
+        return events
 
-        return result
 
 # ==========================================
-# 3. EXECUTION TEST
+# 4. EXECUTION TEST
 # ==========================================
 if __name__ == "__main__":
     print("--- SCENARIO 1: Normal Operation ---")
@@ -97,3 +377,49 @@ if __name__ == "__main__":
     print("\n--- SCENARIO 3: Real-time Disaster Pattern (Dynamic Check) ---")
     # Pipe is wrong AND pressure is spiking
     print(json.dumps(HydraulicSafetyVerify.check_hydraulic_integrity(12.0, 16.0, 65.0), indent=2))
+
+    print("\n--- SCENARIO 4: Fleet Sweep (Batch Mode) ---")
+    rng = np.random.default_rng(0)
+    n = 100_000
+    designed = np.full(n, 12.0)
+    field = np.where(rng.random(n) < 0.01, 16.0, 12.0)
+    gradient = rng.gamma(2.0, 5.0, n)
+    sweep = HydraulicSafetyVerify.check_hydraulic_integrity_batch(designed, field, gradient)
+    counts = np.bincount(sweep["status"], minlength=len(STATUS_CODES))
+    print({code: int(c) for code, c in zip(STATUS_CODES, counts)})
+
+    print("\n--- SCENARIO 5: Streaming dP/dt Detector (1 kHz Servo Feed) ---")
+    fs = 1000
+    t = np.arange(60 * fs) / fs
+    pressure = 40.0 + 0.05 * rng.standard_normal(t.size)
+    rise = np.clip(t - 30.0, 0.0, 0.5)
+    pressure += 320.0 * rise ** 2  # non-linear rise from t=30 s, dP/dt ramps up to 320 bar/s, then holds
+    detector = PressureGradientDetector(sample_rate_hz=fs, channel="servo_A")
+    started = time.perf_counter()
+    events = []
+    for chunk in np.array_split(pressure, pressure.size // 100):
+        events.extend(detector.process(chunk))
+    per_sample_us = (time.perf_counter() - started) / pressure.size * 1e6
+    print(json.dumps(events, indent=2))
+    print(f"Per-sample cost: {per_sample_us:.3f} us")
+
+    print("\n--- SCENARIO 6: Signature Registry (300 Historical Incidents) ---")
+    catalog = IncidentSignatureRegistry([legacy_incident_data])
+    for k in range(299):
+        catalog.add({
+            "incident_id": f"LEG-SYN-{k:03d}",
+            "pattern_matching_signature": {
+                "sensor_type": SERVO_PRESSURE_SENSOR if k % 3 else "PRESSURE_TRANSDUCER_PENSTOCK",
+                "waveform_type": "NON_LINEAR_SPIKE",
+                "trigger_gradient_bar_per_sec": 60.0 + k,
+            },
+        })
+    detector = PressureGradientDetector(sample_rate_hz=fs, registry=catalog, channel="servo_A")
+    started = time.perf_counter()
+    events = []
+    for chunk in np.array_split(pressure, pressure.size // 100):
+        events.extend(detector.process(chunk))
+    per_sample_us = (time.perf_counter() - started) / pressure.size * 1e6
+    print(f"{len(catalog)} signatures, {len(events)} events, first: {events[0]['incident_id']}, last: {events[-1]['incident_id']}")
+    print(f"Per-sample cost: {per_sample_us:.3f} us")
+    print(HydraulicSafetyVerify.check_hydraulic_integrity(12.0, 12.0, 62.5, registry=catalog)["warnings"])
@@ -1,6 +1,16 @@
+import csv
 import enum
+import json
+import time
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Literal
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, List, Literal, Tuple, Union
+
+import numpy as np
+
 
 class TurbineStatus(enum.Enum):
     RUNNING = "RUNNING"
@@ -20,6 +30,221 @@ class TempTrend:
         if len(last_3) < 2: return False
         return last_3[-1] > last_3[-2] + 2.0 # Sudden 2 degree jump
 
+class RingTempTrend:
+    """
+    Fixed-capacity TempTrend for long-running guard loops.
+
+    Samples live in a preallocated array('d') ring; running sums over the
+    window keep mean, least-squares slope and rate of rise at O(1) per sample.
+    The sums are rebuilt from the buffer once per `capacity` samples so
+    floating-point drift cannot accumulate (amortized O(1)).
+    """
+    __slots__ = ("capacity", "rise_threshold_c", "_buf", "_head", "_count", "_sum", "_sum_xy", "_since_resync")
+
+    def __init__(self, capacity: int = 64, rise_threshold_c: float = 2.0, values: Iterable[float] = ()):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.rise_threshold_c = rise_threshold_c
+        self._buf = array('d', bytes(8 * capacity))
+        self._head = 0  # index of the oldest sample
+        self._count = 0
+        self._sum = 0.0     # sum of y over the window
+        self._sum_xy = 0.0  # sum of x*y, x = 0 (oldest) .. count-1 (newest)
+        self._since_resync = 0
+        self.extend(values)
+
+    def append(self, value: float):
+        y = float(value)
+        n = self._count
+        if n < self.capacity:
+            self._buf[(self._head + n) % self.capacity] = y
+            self._sum_xy += n * y
+            self._sum += y
+            self._count = n + 1
+        else:
+            # Window slides by one: every remaining x drops by 1, the new sample gets x = n-1
+            oldest = self._buf[self._head]
+            self._buf[self._head] = y
+            self._head = (self._head + 1) % self.capacity
+            self._sum_xy += -(self._sum - oldest) + (n - 1) * y
+            self._sum += y - oldest
+        self._since_resync += 1
+        if self._since_resync >= self.capacity:
+            self._resync()
+
+    def extend(self, values: Iterable[float]):
+        for v in values:
+            self.append(v)
+
+    def _resync(self):
+        s = sxy = 0.0
+        for x in range(self._count):
+            y = self._buf[(self._head + x) % self.capacity]
+            s += y
+            sxy += x * y
+        self._sum, self._sum_xy, self._since_resync = s, sxy, 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _at(self, back: int) -> float:
+        """Sample `back` steps before the newest (0 = newest)."""
+        return self._buf[(self._head + self._count - 1 - back) % self.capacity]
+
+    @property
+    def values(self) -> List[float]:
+        """Window contents, oldest first (O(capacity); for inspection, not the hot path)."""
+        return [self._buf[(self._head + i) % self.capacity] for i in range(self._count)]
+
+    def last(self) -> float:
+        return self._at(0) if self._count else float("nan")
+
+    def rate_of_rise(self) -> float:
+        """Change between the two newest samples (deg C per sample)."""
+        return self._at(0) - self._at(1) if self._count >= 2 else 0.0
+
+    def mean(self) -> float:
+        return self._sum / self._count if self._count else float("nan")
+
+    def slope(self) -> float:
+        """Least-squares slope over the window (deg C per sample)."""
+        n = self._count
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self._sum_xy - sum_x * self._sum) / (n * sum_xx - sum_x * sum_x)
+
+    def is_increasing(self) -> bool:
+        # Same rule as TempTrend: sudden jump of more than rise_threshold_c between the last two samples
+        return self._count >= 2 and self._at(0) > self._at(1) + self.rise_threshold_c
+
+# Fleet evaluation encodes TurbineStatus by its position in this tuple
+TURBINE_STATUS_CODES = tuple(TurbineStatus)
+STATUS_CODE = {status: code for code, status in enumerate(TURBINE_STATUS_CODES)}
+
+# check_bearing_integrity verdicts; evaluate_fleet returns indices into this tuple
+BEARING_OK = "STATUS_OK"
+BEARING_GREASE_CRITICAL = "CRITICAL: Excessive grease in seal area. Risk of seal blowout on startup! Perform Manual Seal Inspection."
+BEARING_THERMAL_EMERGENCY = "EMERGENCY: Post-stop temperature surge! Potential bearing welding detected. Check Cooling flow."
+BEARING_RESULTS = (BEARING_OK, BEARING_GREASE_CRITICAL, BEARING_THERMAL_EMERGENCY)
+# evaluate_fleet codes; index into BEARING_RESULTS
+BEARING_CODE_OK, BEARING_CODE_GREASE_CRITICAL, BEARING_CODE_THERMAL_EMERGENCY = 0, 1, 2
+
+
+def fleet_dtype(window: int = 3) -> np.dtype:
+    """
+    Structured record for one bearing in IntelligenceGuard.evaluate_fleet.
+    `temps` holds the newest `window` samples, oldest first; pad missing history with NaN on the left.
+    """
+    if window < 2:
+        raise ValueError("window must hold at least 2 samples")
+    return np.dtype([
+        ("status", np.uint8),
+        ("lubrication_cycles", np.int32),
+        ("temps", np.float64, (window,)),
+    ])
+
+
+# Linear thermal expansion coefficients (1/deg C) for Pelton shaft materials
+THERMAL_EXPANSION_ALPHA = {
+    "steel": 12e-6,            # carbon steel shaft (default)
+    "13cr4ni": 10.5e-6,        # martensitic stainless runner/shaft steel
+    "stainless_austenitic": 16.5e-6,
+    "cast_iron": 10.5e-6,
+}
+
+
+def format_offset_recommendation(required_cold_offset_mm: float) -> str:
+    return f"Set cold nozzle offset by {round(required_cold_offset_mm, 3)}mm to compensate for growth."
+
+
+def _resolve_alpha(material: str = "steel", alpha: float = None) -> float:
+    if alpha is not None:
+        return alpha
+    try:
+        return THERMAL_EXPANSION_ALPHA[material.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown material '{material}'. Known: {sorted(THERMAL_EXPANSION_ALPHA)}") from None
+
+
+class PeltonOffsetTable:
+    """
+    Precomputed cold-offset table over a (machine temp x shaft length) grid with
+    bilinear lookup. Points outside the grid extrapolate linearly from the edge cell.
+    """
+    __slots__ = ("temps_c", "lengths_m", "offsets_mm", "_temps", "_lengths", "_rows")
+
+    def __init__(self, temps_c, lengths_m, offsets_mm):
+        self.temps_c = np.asarray(temps_c, dtype=float)
+        self.lengths_m = np.asarray(lengths_m, dtype=float)
+        self.offsets_mm = np.asarray(offsets_mm, dtype=float)
+        # Plain-Python copies: scalar lookups avoid numpy per-call overhead
+        self._temps = self.temps_c.tolist()
+        self._lengths = self.lengths_m.tolist()
+        self._rows = self.offsets_mm.tolist()
+
+    @staticmethod
+    def _cell(axis: List[float], value: float):
+        i = min(max(bisect_right(axis, value) - 1, 0), len(axis) - 2)
+        return i, (value - axis[i]) / (axis[i + 1] - axis[i])
+
+    def lookup(self, machine_temp_c: float, shaft_length_m: float) -> float:
+        """Required cold offset (mm) for one point."""
+        i, u = self._cell(self._temps, machine_temp_c)
+        j, v = self._cell(self._lengths, shaft_length_m)
+        r0, r1 = self._rows[i], self._rows[i + 1]
+        return (1 - u) * ((1 - v) * r0[j] + v * r0[j + 1]) + u * ((1 - v) * r1[j] + v * r1[j + 1])
+
+    def lookup_many(self, machine_temps_c, shaft_lengths_m) -> np.ndarray:
+        """Vectorized lookup for aligned (or broadcastable) arrays of points."""
+        t, length = np.broadcast_arrays(np.asarray(machine_temps_c, dtype=float), np.asarray(shaft_lengths_m, dtype=float))
+        i = np.clip(np.searchsorted(self.temps_c, t, side="right") - 1, 0, len(self.temps_c) - 2)
+        j = np.clip(np.searchsorted(self.lengths_m, length, side="right") - 1, 0, len(self.lengths_m) - 2)
+        u = (t - self.temps_c[i]) / (self.temps_c[i + 1] - self.temps_c[i])
+        v = (length - self.lengths_m[j]) / (self.lengths_m[j + 1] - self.lengths_m[j])
+        z = self.offsets_mm
+        return (1 - u) * ((1 - v) * z[i, j] + v * z[i, j + 1]) + u * ((1 - v) * z[i + 1, j] + v * z[i + 1, j + 1])
+
+
+# classify_damage_texture verdicts; the batch classifier returns indices into this tuple
+DAMAGE_INDETERMINATE, DAMAGE_EROSION, DAMAGE_CAVITATION = 0, 1, 2
+DAMAGE_CLASSES = (
+    {"diagnosis": "INDETERMINATE", "action": "Manual inspection required."},
+    {
+        "diagnosis": "EROSION (SAND/SEDIMENT)",
+        "visual_signature": "Polished, smooth wear pattern.",
+        "action": "Check Desilter (Taložnik) and Intake Filters."
+    },
+    {
+        "diagnosis": "CAVITATION",
+        "visual_signature": "Swiss-cheese texture (Porous, sharp pits).",
+        "action": "Check Tailwater Level and Vacuum Breaker."
+    },
+)
+DAMAGE_FEATURE_SUFFIXES = (".npy", ".csv", ".json")
+
+
+def load_texture_features(path: Path) -> np.ndarray:
+    """
+    Reads one feature file as an (n, 2) [smoothness_score, edge_sharpness] matrix.
+    .npy: (n, 2) array | .csv: header with both column names | .json: list of texture dicts.
+    Missing scores become NaN (classified with the 0.5 default).
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.asarray(np.load(path), dtype=float).reshape(-1, 2)
+    if path.suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            rows = [(r.get("smoothness_score") or "nan", r.get("edge_sharpness") or "nan") for r in csv.DictReader(f)]
+        return np.array(rows, dtype=float).reshape(-1, 2)
+    if path.suffix == ".json":
+        items = json.loads(path.read_text(encoding="utf-8"))
+        return np.array([(d.get("smoothness_score", np.nan), d.get("edge_sharpness", np.nan)) for d in items], dtype=float).reshape(-1, 2)
+    raise ValueError(f"Unsupported feature file: {path}")
+
+
 class IntelligenceGuard:
     """
     The Intelligence Guard
@@ -29,20 +254,40 @@ class IntelligenceGuard:
     MAX_CYCLES_STANDBY = 5 # Max Grease cycles allowed while stopped before inspection needed
 
     @staticmethod
-    def check_bearing_integrity(current_status: TurbineStatus, lubrication_cycles: int, temp_trend: TempTrend) -> str:
+    def check_bearing_integrity(current_status: TurbineStatus, lubrication_cycles: int, temp_trend: Union[TempTrend, RingTempTrend]) -> str:
         """
         Scenario: The Greasing/Seal Disaster (PIT Kaplan) & Thermal Inertia
         """
         # Logic for Example 3: Too much grease during Standby
         if current_status == TurbineStatus.STOPPED and lubrication_cycles > IntelligenceGuard.MAX_CYCLES_STANDBY:
-            return "CRITICAL: Excessive grease in seal area. Risk of seal blowout on startup! Perform Manual Seal Inspection."
+            return BEARING_GREASE_CRITICAL
 
         # Logic for Thermal Inertia (Temp rise after stop)
         if current_status == TurbineStatus.SHUTDOWN_IN_PROGRESS:
             if temp_trend.is_increasing():
-                 return "EMERGENCY: Post-stop temperature surge! Potential bearing welding detected. Check Cooling flow."
+                 return BEARING_THERMAL_EMERGENCY
                  
-        return "STATUS_OK"
+        return BEARING_OK
+
+    @staticmethod
+    def evaluate_fleet(fleet: np.ndarray, rise_threshold_c: float = 2.0) -> np.ndarray:
+        """
+        check_bearing_integrity for a whole fleet in one vectorized pass.
+
+        :param fleet: Structured array of fleet_dtype(window) records
+        :return: uint8 array of BEARING_RESULTS indices, one per bearing
+        """
+        status = fleet["status"]
+        temps = fleet["temps"]
+
+        grease = (status == STATUS_CODE[TurbineStatus.STOPPED]) & (fleet["lubrication_cycles"] > IntelligenceGuard.MAX_CYCLES_STANDBY)
+        # NaN padding compares False, matching TempTrend's "fewer than 2 samples" rule
+        thermal = (status == STATUS_CODE[TurbineStatus.SHUTDOWN_IN_PROGRESS]) & (temps[:, -1] > temps[:, -2] + rise_threshold_c)
+
+        result = np.full(len(fleet), BEARING_CODE_OK, dtype=np.uint8)
+        result[thermal] = BEARING_CODE_THERMAL_EMERGENCY
+        result[grease] = BEARING_CODE_GREASE_CRITICAL  # grease rule is checked first in the scalar path
+        return result
 
     @staticmethod
     def calculate_pelton_thermal_offset(machine_temp_c: float, shaft_length_m: float, ambient_temp_c: float = 20.0) -> dict:
@@ -65,9 +310,37 @@ class IntelligenceGuard:
         return {
             "current_temp_c": machine_temp_c,
             "thermal_expansion_mm": round(expansion_mm, 3),
-            "alignment_recommendation": f"Set cold nozzle offset by {round(required_cold_offset_mm, 3)}mm to compensate for growth."
+            "alignment_recommendation": format_offset_recommendation(required_cold_offset_mm)
         }
 
+    @staticmethod
+    def pelton_thermal_offset_grid(machine_temps_c, shaft_lengths_m, ambient_temp_c: float = 20.0, material: str = "steel", alpha: float = None) -> dict:
+        """
+        calculate_pelton_thermal_offset over a whole temperature x shaft-length grid.
+        Returns arrays only; use format_offset_recommendation() for text on demand.
+
+        :param material: Key of THERMAL_EXPANSION_ALPHA (ignored if alpha is given)
+        :return: {"machine_temp_c": (T,), "shaft_length_m": (L,), "thermal_expansion_mm": (T, L), "cold_offset_mm": (T, L)}
+        """
+        temps = np.asarray(machine_temps_c, dtype=float).ravel()
+        lengths = np.asarray(shaft_lengths_m, dtype=float).ravel()
+        coeff = _resolve_alpha(material, alpha)
+        expansion = np.multiply.outer((temps - ambient_temp_c) * coeff, lengths * 1000)
+        return {
+            "machine_temp_c": temps,
+            "shaft_length_m": lengths,
+            "thermal_expansion_mm": expansion,
+            "cold_offset_mm": -expansion,
+        }
+
+    @staticmethod
+    def pelton_offset_table(temp_range_c=(0.0, 120.0, 1.0), length_range_m=(0.5, 15.0, 0.1), ambient_temp_c: float = 20.0, material: str = "steel", alpha: float = None) -> PeltonOffsetTable:
+        """
+        Cached lookup table for the commissioning hot path.
+        Ranges are (start, stop, step) with stop inclusive; one table is built per distinct argument set.
+        """
+        return _cached_offset_table(tuple(temp_range_c), tuple(length_range_m), ambient_temp_c, _resolve_alpha(material, alpha))
+
     @staticmethod
     def classify_damage_texture(texture_analysis: dict) -> dict:
         """
@@ -77,19 +350,73 @@ class IntelligenceGuard:
         sharpness = texture_analysis.get("edge_sharpness", 0.5)    # 0 = Dull, 1 = Sharp edges
         
         if smoothness > 0.8:
-            return {
-                "diagnosis": "EROSION (SAND/SEDIMENT)",
-                "visual_signature": "Polished, smooth wear pattern.",
-                "action": "Check Desilter (Taložnik) and Intake Filters."
-            }
+            return dict(DAMAGE_CLASSES[DAMAGE_EROSION])
         elif smoothness < 0.4 and sharpness > 0.7:
-             return {
-                "diagnosis": "CAVITATION",
-                "visual_signature": "Swiss-cheese texture (Porous, sharp pits).",
-                "action": "Check Tailwater Level and Vacuum Breaker."
-            }
+             return dict(DAMAGE_CLASSES[DAMAGE_CAVITATION])
         
-        return {"diagnosis": "INDETERMINATE", "action": "Manual inspection required."}
+        return dict(DAMAGE_CLASSES[DAMAGE_INDETERMINATE])
+
+    @staticmethod
+    def classify_damage_texture_batch(smoothness_scores, edge_sharpness=None) -> dict:
+        """
+        classify_damage_texture for many patches in one vectorized pass.
+
+        :param smoothness_scores: (n,) scores, or an (n, 2) [smoothness, sharpness] feature matrix
+        :param edge_sharpness: (n,) scores when smoothness_scores is 1-D
+        :return: {"labels": uint8 indices into DAMAGE_CLASSES, "counts": {diagnosis: count}}
+        """
+        if edge_sharpness is None:
+            features = np.asarray(smoothness_scores, dtype=float).reshape(-1, 2)
+            smoothness, sharpness = features[:, 0], features[:, 1]
+        else:
+            smoothness = np.asarray(smoothness_scores, dtype=float).ravel()
+            sharpness = np.asarray(edge_sharpness, dtype=float).ravel()
+        # Missing scores take the scalar path's 0.5 default
+        smoothness = np.where(np.isnan(smoothness), 0.5, smoothness)
+        sharpness = np.where(np.isnan(sharpness), 0.5, sharpness)
+
+        labels = np.full(smoothness.shape, DAMAGE_INDETERMINATE, dtype=np.uint8)
+        labels[(smoothness < 0.4) & (sharpness > 0.7)] = DAMAGE_CAVITATION
+        labels[smoothness > 0.8] = DAMAGE_EROSION
+        return {"labels": labels, "counts": IntelligenceGuard._damage_counts(labels)}
+
+    @staticmethod
+    def _damage_counts(labels: np.ndarray) -> dict:
+        counts = np.bincount(labels, minlength=len(DAMAGE_CLASSES))
+        return {cls["diagnosis"]: int(c) for cls, c in zip(DAMAGE_CLASSES, counts)}
+
+    @staticmethod
+    def iter_damage_survey(directory) -> Iterator[Tuple[Path, np.ndarray]]:
+        """
+        Streams a blade survey: classifies every feature file under `directory`
+        (sorted, recursive) one at a time, yielding (path, labels).
+        """
+        files = sorted(p for p in Path(directory).rglob("*") if p.suffix in DAMAGE_FEATURE_SUFFIXES)
+        for path in files:
+            yield path, IntelligenceGuard.classify_damage_texture_batch(load_texture_features(path))["labels"]
+
+    @staticmethod
+    def classify_damage_survey(directory) -> dict:
+        """Per-file and total class counts for a directory of feature files."""
+        per_file = {}
+        totals = np.zeros(len(DAMAGE_CLASSES), dtype=np.int64)
+        for path, labels in IntelligenceGuard.iter_damage_survey(directory):
+            per_file[str(path)] = IntelligenceGuard._damage_counts(labels)
+            totals += np.bincount(labels, minlength=len(DAMAGE_CLASSES))
+        return {
+            "files": per_file,
+            "counts": {cls["diagnosis"]: int(c) for cls, c in zip(DAMAGE_CLASSES, totals)},
+            "patches": int(totals.sum()),
+        }
+
+@lru_cache(maxsize=32)
+def _cached_offset_table(temp_range_c, length_range_m, ambient_temp_c, alpha) -> PeltonOffsetTable:
+    t0, t1, dt = temp_range_c
+    l0, l1, dl = length_range_m
+    temps = np.arange(t0, t1 + dt / 2, dt)
+    lengths = np.arange(l0, l1 + dl / 2, dl)
+    grid = IntelligenceGuard.pelton_thermal_offset_grid(temps, lengths, ambient_temp_c, alpha=alpha)
+    return PeltonOffsetTable(temps, lengths, grid["cold_offset_mm"])
 
 # --- TEST EXECUTION ---
 if __name__ == "__main__":
@@ -107,10 +434,64 @@ if __name__ == "__main__":
         temp_trend=TempTrend([55, 58, 62]) # Increasing!
     ))
 
+    print("\n--- 2b. THERMAL INERTIA CHECK (RING BUFFER TREND) ---")
+    ring = RingTempTrend(capacity=8, values=[50, 51, 52, 52, 53, 55, 58, 62])
+    print(IntelligenceGuard.check_bearing_integrity(
+        TurbineStatus.SHUTDOWN_IN_PROGRESS,
+        lubrication_cycles=0,
+        temp_trend=ring
+    ))
+    print(f"mean={ring.mean():.2f}C slope={ring.slope():.3f}C/sample rate_of_rise={ring.rate_of_rise():.1f}C")
+
     print("\n--- 3. PELTON THERMAL DRIFT ---")
     # 5m Shaft, Cold Start (20C) vs Operating (65C -> Delta 45C)
     print(IntelligenceGuard.calculate_pelton_thermal_offset(machine_temp_c=65, shaft_length_m=5.0))
 
+    print("\n--- 3b. PELTON OFFSET GRID / LOOKUP TABLE ---")
+    grid = IntelligenceGuard.pelton_thermal_offset_grid(np.arange(20, 81, 10), [2.0, 5.0, 8.0], material="13cr4ni")
+    print("cold offset (mm), rows = 20..80C, cols = 2/5/8 m shaft:")
+    print(np.round(grid["cold_offset_mm"], 3))
+    table = IntelligenceGuard.pelton_offset_table()
+    offset = table.lookup(65.0, 5.0)
+    print(f"table lookup 65C / 5m: {offset:.3f}mm -> {format_offset_recommendation(offset)}")
+
     print("\n--- 4. VISUAL FORENSICS ---")
     print("Case A:", IntelligenceGuard.classify_damage_texture({"smoothness_score": 0.9, "edge_sharpness": 0.2}))
     print("Case B:", IntelligenceGuard.classify_damage_texture({"smoothness_score": 0.2, "edge_sharpness": 0.9}))
+
+    print("\n--- 4b. BLADE SURVEY (BATCH + DIRECTORY STREAM) ---")
+    import tempfile
+    patches = np.random.default_rng(11).random((200_000, 2))
+    started = time.perf_counter()
+    survey = IntelligenceGuard.classify_damage_texture_batch(patches)
+    print(f"{len(patches)} patches in {(time.perf_counter() - started) * 1000:.1f} ms: {survey['counts']}")
+    with tempfile.TemporaryDirectory() as survey_dir:
+        for blade, chunk in enumerate(np.array_split(patches, 20)):
+            np.save(Path(survey_dir) / f"blade_{blade:02d}.npy", chunk)
+        started = time.perf_counter()
+        report = IntelligenceGuard.classify_damage_survey(survey_dir)
+        print(f"{len(report['files'])} feature files streamed in {(time.perf_counter() - started) * 1000:.1f} ms: {report['counts']}")
+
+    print("\n--- 5. FLEET EVALUATION (VECTORIZED vs PER-CALL) ---")
+    rng = np.random.default_rng(7)
+    n_bearings = 20_000
+    fleet = np.zeros(n_bearings, dtype=fleet_dtype(3))
+    fleet["status"] = rng.integers(0, len(TURBINE_STATUS_CODES), n_bearings)
+    fleet["lubrication_cycles"] = rng.integers(0, 9, n_bearings)
+    fleet["temps"] = 50 + np.cumsum(rng.normal(0.0, 1.5, (n_bearings, 3)), axis=1)
+
+    started = time.perf_counter()
+    looped = [
+        IntelligenceGuard.check_bearing_integrity(TURBINE_STATUS_CODES[rec["status"]], int(rec["lubrication_cycles"]), TempTrend(rec["temps"].tolist()))
+        for rec in fleet
+    ]
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    codes = IntelligenceGuard.evaluate_fleet(fleet)
+    vector_s = time.perf_counter() - started
+
+    assert looped == [BEARING_RESULTS[c] for c in codes]
+    counts = np.bincount(codes, minlength=len(BEARING_RESULTS))
+    print(f"{n_bearings} bearings: OK={counts[0]} GREASE={counts[1]} THERMAL={counts[2]}")
+    print(f"per-call loop {loop_s * 1000:.1f} ms | vectorized {vector_s * 1000:.2f} ms | speedup x{loop_s / vector_s:.0f}")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+knowledge_dedup.py
+
+Near-duplicate clustering for extracted expert knowledge entries
+(output of extract_knowledge.py).
+
+Exact dedup only drops identical (symptom_key, diagnosis) pairs; translated
+pages, revisions and "(Instance N)" clones survive it. This stage normalizes
+each entry, builds character shingles, computes MinHash signatures (numpy) and
+finds candidate pairs with LSH banding, so the work grows roughly linearly
+with the number of entries instead of comparing all pairs. Candidates whose
+estimated Jaccard similarity reaches the threshold are merged with union-find;
+each cluster keeps its most complete entry.
+
+Usage:
+    python scripts/knowledge_dedup.py --in scripts/extracted_expert_knowledge.json --out deduped.json --report clusters.json
+    python scripts/knowledge_dedup.py --in extracted.ndjson --threshold 0.7
+
+    # or as part of the extraction run
+    python scripts/extract_knowledge.py --near-dup
+"""
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+SHINGLE_BASE = np.uint64(1_000_003)
+SIGNATURE_BLOCK = 65536  # shingles per vectorized signature block (x num_perm x 8 bytes of scratch)
+LARGE_BUCKET = 64  # LSH buckets above this size are only compared against their first member
+
+INSTANCE_RE = re.compile(r'\(\s*instance\s+\d+\s*\)', re.I)
+NON_WORD_RE = re.compile(r'[\W_]+')
+
+SEVERITY_RANK = {'CRITICAL': 3, 'HIGH': 2, 'MEDIUM': 1, 'LOW': 0}
+
+
+# ==========================================
+# 1. NORMALIZATION & SHINGLES
+# ==========================================
+def normalize_text(text: str) -> str:
+    """Lowercase, drop '(Instance N)' clone markers, collapse punctuation/underscores/whitespace."""
+    text = INSTANCE_RE.sub(' ', (text or '').replace('_', ' '))
+    return NON_WORD_RE.sub(' ', text.lower()).strip()
+
+
+def entry_text(entry: Dict) -> str:
+    return normalize_text(' '.join([entry.get('symptom_key', ''), entry.get('diagnosis', ''), entry.get('recommended_action', '')]))
+
+
+def shingle_hashes(text: str, k: int = 5) -> np.ndarray:
+    """
+    Distinct 64-bit polynomial hashes of the character k-shingles, computed on
+    the code point array (texts shorter than k form one shingle).
+    """
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    width = max(len(codes) - k + 1, 1)
+    span = len(codes) - width + 1
+    h = np.zeros(width, dtype=np.uint64)
+    for j in range(span):
+        h = h * SHINGLE_BASE + codes[j:j + width]  # wraps mod 2^64
+    return np.unique(h)
+
+
+# ==========================================
+# 2. MINHASH + LSH
+# ==========================================
+class MinHasher:
+    """
+    MinHash with num_perm multiply-add-shift hash functions
+    h(x) = ((a*x + b) mod 2^64) >> 32 over 64-bit shingle hashes.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = (rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]  # odd
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None]
+
+    def signatures(self, shingle_sets: List[np.ndarray]) -> np.ndarray:
+        """(N, num_perm) uint32 signatures, computed in blocks of ~SIGNATURE_BLOCK shingles."""
+        out = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint32)
+        start = 0
+        while start < len(shingle_sets):
+            stop, total = start, 0
+            while stop < len(shingle_sets) and (total == 0 or total + len(shingle_sets[stop]) <= SIGNATURE_BLOCK):
+                total += len(shingle_sets[stop])
+                stop += 1
+            block = shingle_sets[start:stop]
+            offsets = np.cumsum([0] + [len(x) for x in block[:-1]])
+            permuted = (self.a * np.concatenate(block)[None, :] + self.b) >> np.uint64(32)
+            out[start:stop] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            start = stop
+        return out
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_near_duplicates(texts: List[str], threshold: float = 0.6, bands: int = 32, rows: int = 4,
+                            shingle_size: int = 5, seed: int = 1) -> Tuple[List[List[int]], np.ndarray]:
+    """
+    Groups texts whose estimated Jaccard similarity >= threshold.
+
+    bands * rows hash functions are used; pairs sharing any identical band
+    become candidates (the LSH S-curve crosses 50% near (1/bands)^(1/rows),
+    ~0.42 for the defaults) and are then checked on the full signature.
+    Buckets larger than LARGE_BUCKET are checked against their first member
+    only, which keeps degenerate buckets linear.
+
+    :return: (clusters as sorted index lists, signatures (N, bands*rows))
+    """
+    sigs = MinHasher(bands * rows, seed).signatures([shingle_hashes(t, shingle_size) for t in texts])
+    parent = list(range(len(texts)))
+
+    def similar(i: int, j: int) -> bool:
+        return float(np.mean(sigs[i] == sigs[j])) >= threshold
+
+    for band in range(bands):
+        # One opaque key per row of the band; np.unique groups identical keys
+        keys = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows]).view(np.dtype((np.void, 4 * rows))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        order = np.argsort(inverse, kind='stable')
+        starts = np.cumsum(counts) - counts
+        for g in np.flatnonzero(counts >= 2).tolist():
+            members = order[starts[g]:starts[g] + counts[g]].tolist()
+            pairs = ((members[0], m) for m in members[1:]) if len(members) > LARGE_BUCKET else (
+                (members[x], members[y]) for x in range(len(members)) for y in range(x + 1, len(members)))
+            for i, j in pairs:
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri != rj and similar(i, j):
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return sorted(clusters.values()), sigs
+
+
+# ==========================================
+# 3. REPRESENTATIVES & REPORT
+# ==========================================
+def completeness(entry: Dict) -> tuple:
+    """Sort key for the best representative: filled fields, no clone marker, detail, severity."""
+    return (
+        bool(entry.get('diagnosis')) + bool(entry.get('recommended_action')),
+        not INSTANCE_RE.search(entry.get('symptom_key', '').replace('_', ' ')),
+        len(entry.get('diagnosis', '')) + len(entry.get('recommended_action', '')),
+        SEVERITY_RANK.get(entry.get('severity'), 1),
+    )
+
+
+def near_dedupe(entries: List[Dict], threshold: float = 0.6, bands: int = 32, rows: int = 4,
+                shingle_size: int = 5) -> Tuple[List[Dict], List[Dict]]:
+    """
+    :return: (kept entries in original order, report of clusters with more than one member)
+    """
+    clusters, sigs = cluster_near_duplicates([entry_text(e) for e in entries], threshold, bands, rows, shingle_size)
+    keep = []
+    report = []
+    for members in clusters:
+        # max() keeps the earliest member on ties
+        best = max(members, key=lambda i: completeness(entries[i]))
+        keep.append(best)
+        if len(members) > 1:
+            report.append({
+                'representative': {'index': best, 'symptom_key': entries[best]['symptom_key'], 'source_file': entries[best].get('source_file')},
+                'size': len(members),
+                'members': [
+                    {'index': i, 'symptom_key': entries[i]['symptom_key'], 'source_file': entries[i].get('source_file'),
+                     'similarity': round(float(np.mean(sigs[i] == sigs[best])), 3)}
+                    for i in members if i != best
+                ],
+            })
+    report.sort(key=lambda c: -c['size'])
+    return [entries[i] for i in sorted(keep)], report
+
+
+def load_entries(path: Path) -> List[Dict]:
+    """Reads a JSON array or NDJSON file of entries."""
+    text = path.read_text(encoding='utf-8')
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cluster near-duplicate knowledge entries (MinHash/LSH)')
+    parser.add_argument('--in', dest='src', default='scripts/extracted_expert_knowledge.json', help='JSON array or NDJSON of entries')
+    parser.add_argument('--out', help='Deduplicated JSON output (default: <in>.dedup.json)')
+    parser.add_argument('--report', help='Cluster report JSON (default: <in>.clusters.json)')
+    parser.add_argument('--threshold', type=float, default=0.6, help='Estimated Jaccard similarity to merge')
+    parser.add_argument('--bands', type=int, default=32)
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--shingle-size', type=int, default=5)
+    args = parser.parse_args()
+
+    src = Path(args.src)
+    out_path = Path(args.out) if args.out else src.with_suffix('.dedup.json')
+    report_path = Path(args.report) if args.report else src.with_suffix('.clusters.json')
+    entries = load_entries(src)
+    kept, report = near_dedupe(entries, args.threshold, args.bands, args.rows, args.shingle_size)
+    out_path.write_text(json.dumps(kept, indent=2, ensure_ascii=False), encoding='utf-8')
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f'{len(entries)} entries -> {len(kept)} after near-duplicate merge ({len(report)} clusters), wrote {out_path} and {report_path}')
+
+
+if __name__ == '__main__':
+    main()
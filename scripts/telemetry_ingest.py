@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+telemetry_ingest.py
+
+Bulk ingest of 1 Hz telemetry into `realtime_sensor_logs` (anohub_core_db.SensorLog).
+
+Readings are streamed from CSV, NDJSON or numpy arrays and written through
+batched Core INSERTs (executemany) inside tuned SQLite transactions, so memory
+stays constant per batch no matter how many months of data are backfilled.
+
+Usage:
+    python scripts/telemetry_ingest.py --csv unit7_2024.csv
+    python scripts/telemetry_ingest.py --ndjson fleet.ndjson --batch-size 20000 --db sqlite:///anohub_core_enhanced.db
+
+Input columns (CSV header / NDJSON keys):
+    turbine_id, timestamp, vibration_x_mm_s, vibration_y_mm_s,
+    bearing_temp_c, oil_pressure_bar, active_power_mw
+Timestamps may be ISO-8601 strings or epoch seconds (UTC).
+"""
+import argparse
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from anohub_core_db import Base, SensorLog, DATABASE_URL
+
+CHANNELS = (
+    "vibration_x_mm_s",
+    "vibration_y_mm_s",
+    "bearing_temp_c",
+    "oil_pressure_bar",
+    "active_power_mw",
+)
+
+# SQLite tuning for bulk writes. WAL lets dashboards keep reading while we
+# append; synchronous=NORMAL is durable across application crashes in WAL mode.
+# page_size only takes effect on a fresh database file (or after VACUUM).
+SQLITE_PRAGMAS = {
+    "page_size": 8192,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -65536,  # negative = KiB, i.e. 64 MiB page cache
+}
+
+
+# ==========================================
+# 1. SQLITE TUNING
+# ==========================================
+def tune_sqlite(engine: Engine, pragmas: Optional[Dict[str, object]] = None) -> Engine:
+    """Applies bulk-write PRAGMAs to every new connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite":
+        return engine
+    settings = dict(SQLITE_PRAGMAS, **(pragmas or {}))
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        for key, value in settings.items():
+            cur.execute(f"PRAGMA {key}={value}")
+        cur.close()
+
+    return engine
+
+
+# ==========================================
+# 2. READING SOURCES
+# ==========================================
+def parse_timestamp(value) -> datetime:
+    """ISO-8601 string, epoch seconds or datetime -> naive UTC datetime (ORM convention)."""
+    if isinstance(value, datetime):
+        ts = value
+    elif isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+    else:
+        text = str(value).strip()
+        try:
+            return datetime.fromtimestamp(float(text), tz=timezone.utc).replace(tzinfo=None)
+        except ValueError:
+            pass
+        ts = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def normalize_reading(raw: Dict) -> Dict:
+    """Maps a loosely typed reading to the column dict expected by the INSERT."""
+    row = {
+        "turbine_id": int(raw["turbine_id"]),
+        "timestamp": parse_timestamp(raw["timestamp"]),
+    }
+    for ch in CHANNELS:
+        row[ch] = _to_float(raw.get(ch))
+    return row
+
+
+def iter_csv(path: str) -> Iterator[Dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        for raw in csv.DictReader(f):
+            yield normalize_reading(raw)
+
+
+def iter_ndjson(path: str) -> Iterator[Dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield normalize_reading(json.loads(line))
+
+
+def iter_arrays(turbine_id, timestamps, **channels) -> Iterator[Dict]:
+    """
+    Yields readings from column arrays (numpy or lists).
+
+    :param turbine_id: Scalar id for a single unit, or an array aligned with timestamps
+    :param timestamps: Epoch seconds, numpy datetime64 or datetime objects
+    :param channels: Any of CHANNELS as equally long arrays
+    """
+    import numpy as np
+
+    ts = np.asarray(timestamps)
+    if np.issubdtype(ts.dtype, np.datetime64):
+        ts = ts.astype("datetime64[us]").astype(np.int64) / 1e6
+    n = len(ts)
+    ids = np.broadcast_to(np.asarray(turbine_id), (n,))
+    cols = {ch: np.asarray(channels[ch], dtype=float) for ch in CHANNELS if ch in channels}
+    for name, col in cols.items():
+        if len(col) != n:
+            raise ValueError(f"Channel {name} has {len(col)} samples, expected {n}")
+
+    # Convert in slices so the Python objects never outlive one batch worth of rows
+    step = 10000
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        id_part = ids[start:stop].tolist()
+        ts_part = ts[start:stop].tolist()
+        col_parts = {name: col[start:stop].tolist() for name, col in cols.items()}
+        for i in range(stop - start):
+            row = {"turbine_id": int(id_part[i]), "timestamp": parse_timestamp(ts_part[i])}
+            for ch in CHANNELS:
+                part = col_parts.get(ch)
+                v = part[i] if part is not None else None
+                row[ch] = None if v is None or v != v else v  # NaN -> NULL
+            yield row
+
+
+# ==========================================
+# 3. BULK WRITER
+# ==========================================
+def _batched(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_ingest(readings: Iterable[Dict], bind: Optional[Engine] = None, batch_size: int = 10000, progress: bool = False) -> Dict:
+    """
+    Streams readings into realtime_sensor_logs, one transaction per batch.
+
+    :param readings: Iterable of normalized reading dicts (see iter_csv / iter_ndjson / iter_arrays)
+    :param bind: Target engine (defaults to a tuned engine on DATABASE_URL)
+    :param batch_size: Rows per executemany / transaction
+    :return: {"rows": int, "batches": int, "seconds": float, "rows_per_sec": float}
+    """
+    if bind is None:
+        bind = tune_sqlite(create_engine(DATABASE_URL))
+    Base.metadata.create_all(bind, tables=[SensorLog.__table__], checkfirst=True)
+
+    stmt = SensorLog.__table__.insert()
+    rows = 0
+    batches = 0
+    t0 = time.perf_counter()
+    for batch in _batched(readings, batch_size):
+        with bind.begin() as conn:
+            conn.execute(stmt, batch)
+        rows += len(batch)
+        batches += 1
+        if progress:
+            elapsed = time.perf_counter() - t0
+            print(f"   ... {rows} rows ({rows / elapsed:,.0f} rows/s)")
+    seconds = time.perf_counter() - t0
+    return {
+        "rows": rows,
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingest telemetry into realtime_sensor_logs")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--csv", help="CSV file with a header row")
+    src.add_argument("--ndjson", help="Newline-delimited JSON file")
+    parser.add_argument("--db", default=DATABASE_URL, help="SQLAlchemy database URL")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--progress", action="store_true", help="Print throughput after every batch")
+    args = parser.parse_args()
+
+    engine = tune_sqlite(create_engine(args.db))
+    readings = iter_csv(args.csv) if args.csv else iter_ndjson(args.ndjson)
+    stats = bulk_ingest(readings, bind=engine, batch_size=args.batch_size, progress=args.progress)
+    print(f"✅ Ingested {stats['rows']} rows in {stats['seconds']}s ({stats['rows_per_sec']:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
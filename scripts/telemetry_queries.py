@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+telemetry_queries.py
+
+Time-range query helpers over the row-oriented sensor tables
+(`realtime_sensor_logs` in anohub_core_db, `sensor_logs` in db_init), built on
+the composite (turbine_id, timestamp) index, plus a scaling benchmark for the
+SQLite backend.
+
+Usage:
+    # Add the composite index to an existing database (create_all skips existing tables)
+    python scripts/telemetry_queries.py --ensure-indexes
+
+    # Query latency at 10M / 50M / 100M rows (needs ~15 GB free disk at 100M;
+    # without --db a temporary database file is used, never the real one)
+    python scripts/telemetry_queries.py --benchmark --db sqlite:///bench_telemetry.db
+    python scripts/telemetry_queries.py --benchmark --rows 1000000 5000000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import Integer, Table, bindparam, cast, create_engine, func, select, text
+from sqlalchemy.engine import Engine
+
+from anohub_core_db import Base, DATABASE_URL, SensorLog
+from telemetry_ingest import tune_sqlite
+from telemetry_store import to_epoch_seconds
+
+DEFAULT_TABLE = SensorLog.__table__
+
+
+def _epoch(col):
+    """SQLite DATETIME text -> float epoch seconds, computed in SQL to skip per-row datetime parsing."""
+    return (func.julianday(col) - 2440587.5) * 86400.0
+
+
+def _bound(value) -> str:
+    """Any accepted timestamp -> the text format SQLAlchemy stores for DateTime on SQLite."""
+    return datetime.fromtimestamp(to_epoch_seconds(value), tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _to_matrix(rows, width: int) -> np.ndarray:
+    # numpy walks Row objects element by element; plain tuples are ~30x faster to convert
+    return np.array([tuple(r) for r in rows], dtype=float).reshape(len(rows), width)
+
+
+def _channels(table: Table) -> List[str]:
+    return [c.name for c in table.columns if c.name not in ("id", "turbine_id", "timestamp")]
+
+
+# ==========================================
+# 1. INDEX MAINTENANCE
+# ==========================================
+def ensure_indexes(bind: Engine, table: Table = DEFAULT_TABLE) -> None:
+    """Creates any index declared on the model that the database does not have yet."""
+    for index in table.indexes:
+        index.create(bind, checkfirst=True)
+
+
+# ==========================================
+# 2. QUERY HELPERS
+# ==========================================
+def latest_per_turbine(bind: Engine, table: Table = DEFAULT_TABLE) -> List[Dict]:
+    """
+    Latest sample of every turbine.
+
+    Walks distinct turbine ids with index seeks (MIN(turbine_id) > previous) and
+    takes one ORDER BY timestamp DESC LIMIT 1 per turbine, so the cost is
+    O(turbines * log rows) instead of a GROUP BY over the whole table.
+    """
+    t = table
+    next_id = select(func.min(t.c.turbine_id)).where(t.c.turbine_id > bindparam("prev"))
+    latest = select(t).where(t.c.turbine_id == bindparam("tid")).order_by(t.c.timestamp.desc()).limit(1)
+
+    out = []
+    with bind.connect() as conn:
+        prev = conn.execute(select(func.min(t.c.turbine_id))).scalar()
+        while prev is not None:
+            row = conn.execute(latest, {"tid": prev}).mappings().first()
+            if row is not None:
+                out.append(dict(row))
+            prev = conn.execute(next_id, {"prev": prev}).scalar()
+    return out
+
+
+def range_query(bind: Engine, turbine_id: int, start, end, channels: Optional[List[str]] = None, table: Table = DEFAULT_TABLE) -> Dict[str, np.ndarray]:
+    """
+    Samples of one turbine with start <= timestamp < end, as numpy arrays
+    ({"timestamp": epoch seconds, <channel>: values}, same shape as ChunkStore.query).
+    """
+    t = table
+    channels = channels or _channels(t)
+    stmt = (
+        select(_epoch(t.c.timestamp), *[t.c[ch] for ch in channels])
+        .where(t.c.turbine_id == turbine_id, t.c.timestamp >= _bound(start), t.c.timestamp < _bound(end))
+        .order_by(t.c.timestamp)
+    )
+    with bind.connect() as conn:
+        rows = conn.execute(stmt).all()
+    data = _to_matrix(rows, len(channels) + 1)
+    out = {"timestamp": data[:, 0]}
+    for i, ch in enumerate(channels):
+        out[ch] = data[:, i + 1]
+    return out
+
+
+def last_minutes(bind: Engine, turbine_id: int, minutes: float, now=None, table: Table = DEFAULT_TABLE) -> Dict[str, np.ndarray]:
+    """Convenience wrapper: the last `minutes` of data for one turbine."""
+    end = to_epoch_seconds(now) if now is not None else time.time()
+    return range_query(bind, turbine_id, end - minutes * 60.0, end + 1e-6, table=table)
+
+
+def downsampled_range(bind: Engine, turbine_id: int, start, end, bucket_seconds: int, channels: Optional[List[str]] = None, table: Table = DEFAULT_TABLE) -> Dict[str, np.ndarray]:
+    """
+    Per-bucket averages for one turbine, aggregated inside SQLite.
+    Returns {"timestamp": bucket start (epoch s), "count": samples, <channel>: mean}.
+    """
+    t = table
+    channels = channels or _channels(t)
+    # CAST truncates, which equals floor for post-1970 timestamps (and avoids "/" meaning true division)
+    seconds = cast(func.strftime("%s", t.c.timestamp), Integer)
+    bucket = cast(seconds / bucket_seconds, Integer).label("bucket")
+    stmt = (
+        select(bucket, func.count(), *[func.avg(t.c[ch]) for ch in channels])
+        .where(t.c.turbine_id == turbine_id, t.c.timestamp >= _bound(start), t.c.timestamp < _bound(end))
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    with bind.connect() as conn:
+        rows = conn.execute(stmt).all()
+    data = _to_matrix(rows, len(channels) + 2)
+    out = {"timestamp": data[:, 0] * bucket_seconds, "count": data[:, 1].astype(np.int64)}
+    for i, ch in enumerate(channels):
+        out[ch] = data[:, i + 2]
+    return out
+
+
+# ==========================================
+# 3. SCALING BENCHMARK
+# ==========================================
+BENCH_TURBINES = 10
+BENCH_T0 = 1_704_067_200  # 2024-01-01T00:00:00Z
+
+
+def _grow_table(bind: Engine, target_rows: int) -> None:
+    """Appends synthetic 1 Hz rows (round-robin over BENCH_TURBINES) inside SQLite until target_rows; ids are assigned by the database."""
+    with bind.begin() as conn:
+        have = conn.execute(text("SELECT COUNT(*) FROM realtime_sensor_logs")).scalar()
+        if have >= target_rows:
+            return
+        conn.execute(text(
+            """
+            WITH RECURSIVE seq(i) AS (SELECT :lo UNION ALL SELECT i + 1 FROM seq WHERE i < :hi)
+            INSERT INTO realtime_sensor_logs
+                (turbine_id, timestamp, vibration_x_mm_s, vibration_y_mm_s, bearing_temp_c, oil_pressure_bar, active_power_mw)
+            SELECT 1 + (i % :turbines),
+                   strftime('%Y-%m-%d %H:%M:%S', :t0 + i / :turbines, 'unixepoch') || '.000000',
+                   (i % 97) / 10.0, (i % 89) / 10.0, 40 + (i % 23), 60 + (i % 11), 12 + (i % 5)
+            FROM seq
+            """
+        ), {"lo": have + 1, "hi": target_rows, "turbines": BENCH_TURBINES, "t0": BENCH_T0})
+
+
+def _median_ms(fn, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return statistics.median(samples)
+
+
+def run_benchmark(bind: Engine, sizes: List[int]) -> List[Dict]:
+    Base.metadata.create_all(bind, tables=[DEFAULT_TABLE], checkfirst=True)
+    ensure_indexes(bind)
+    results = []
+    for size in sorted(sizes):
+        t = time.perf_counter()
+        _grow_table(bind, size)
+        grow_s = time.perf_counter() - t
+        # Newest timestamp of the synthetic series = end of the data set
+        end = BENCH_T0 + size // BENCH_TURBINES
+        row = {
+            "rows": size,
+            "load_s": round(grow_s, 1),
+            "latest_per_turbine_ms": _median_ms(lambda: latest_per_turbine(bind)),
+            "last_10min_ms": _median_ms(lambda: last_minutes(bind, 7, 10, now=end)),
+            "range_1day_ms": _median_ms(lambda: range_query(bind, 7, end - 86400, end)),
+            "downsample_1week_60s_ms": _median_ms(lambda: downsampled_range(bind, 7, end - 7 * 86400, end, 60)),
+        }
+        results.append(row)
+        print(
+            f"{row['rows']:>12,} rows | load {row['load_s']:>7}s | latest/turbine {row['latest_per_turbine_ms']:8.2f} ms"
+            f" | last 10 min {row['last_10min_ms']:8.2f} ms | 1 day {row['range_1day_ms']:8.2f} ms"
+            f" | 1 week @60s {row['downsample_1week_60s_ms']:8.2f} ms"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry time-range query helpers")
+    parser.add_argument("--db", help=f"Database URL (default: {DATABASE_URL}; --benchmark defaults to a temporary file)")
+    parser.add_argument("--ensure-indexes", action="store_true", help="Create missing composite indexes")
+    parser.add_argument("--benchmark", action="store_true", help="Grow a synthetic table and time the helpers")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000_000, 50_000_000, 100_000_000])
+    args = parser.parse_args()
+
+    if args.benchmark and args.db is None:
+        # Never grow synthetic rows into the real database by accident
+        args.db = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_telemetry_'), 'bench_telemetry.db')}"
+        print(f"🔹 Benchmark database: {args.db}")
+    engine = tune_sqlite(create_engine(args.db or DATABASE_URL))
+    if args.ensure_indexes:
+        ensure_indexes(engine)
+        print("✅ Composite (turbine_id, timestamp) index present.")
+    if args.benchmark:
+        print(f"🔹 SQLite scaling benchmark ({BENCH_TURBINES} turbines, 1 Hz, median of 5 runs)")
+        run_benchmark(engine, args.rows)
+
+
+if __name__ == "__main__":
+    main()
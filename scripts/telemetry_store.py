@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+telemetry_store.py
+
+Optional columnar chunk store for turbine telemetry, kept next to the
+row-oriented `realtime_sensor_logs` table (anohub_core_db.SensorChunk).
+
+Each row of `sensor_chunks` holds one (turbine_id, time bucket) with every
+channel stored as a compressed numpy array, so a one-week range scan for one
+turbine reads ~168 rows instead of ~600k and returns arrays directly, without
+ORM hydration per sample.
+
+Usage:
+    # Build / refresh chunks from the existing row table
+    python scripts/telemetry_store.py --compact --turbine 7
+
+    # Read a range back as arrays
+    python scripts/telemetry_store.py --turbine 7 --start 2024-01-01 --end 2024-01-08
+"""
+import argparse
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.engine import Engine
+
+from anohub_core_db import Base, CHUNK_BUCKET_SECONDS, DATABASE_URL, SensorChunk, SensorLog
+from telemetry_ingest import CHANNELS, parse_timestamp, tune_sqlite
+
+COMPRESS_LEVEL = 6
+
+
+# ==========================================
+# 1. ARRAY ENCODING
+# ==========================================
+def encode_timestamps(ts_us: np.ndarray) -> bytes:
+    """int64 microseconds -> first value + deltas, zlib. 1 Hz data compresses to a few bytes."""
+    deltas = np.diff(ts_us.astype(np.int64), prepend=np.int64(0))
+    return zlib.compress(deltas.astype("<i8").tobytes(), COMPRESS_LEVEL)
+
+
+def decode_timestamps(blob: bytes) -> np.ndarray:
+    return np.cumsum(np.frombuffer(zlib.decompress(blob), dtype="<i8"))
+
+
+def encode_channel(values: np.ndarray) -> bytes:
+    """float64 -> byte-shuffled zlib. Shuffling groups exponent bytes so slow signals compress well."""
+    raw = np.ascontiguousarray(values, dtype="<f8").view(np.uint8).reshape(-1, 8)
+    return zlib.compress(raw.T.tobytes(), COMPRESS_LEVEL)
+
+
+def decode_channel(blob: bytes, count: int) -> np.ndarray:
+    shuffled = np.frombuffer(zlib.decompress(blob), dtype=np.uint8).reshape(8, count)
+    return np.ascontiguousarray(shuffled.T).view("<f8").reshape(count)
+
+
+def to_epoch_seconds(value) -> float:
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).timestamp()
+    # parse_timestamp returns naive UTC; astimezone() would read it as local time
+    return parse_timestamp(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+# ==========================================
+# 2. CHUNK STORE
+# ==========================================
+class ChunkStore:
+    """
+    Reads and writes `sensor_chunks`. Timestamps are handled as float epoch
+    seconds (UTC) on the API and stored as int64 microseconds.
+    """
+
+    def __init__(self, bind: Optional[Engine] = None, bucket_seconds: int = CHUNK_BUCKET_SECONDS):
+        self.bind = bind if bind is not None else tune_sqlite(create_engine(DATABASE_URL))
+        self.bucket_seconds = bucket_seconds
+        self.table = SensorChunk.__table__
+        Base.metadata.create_all(self.bind, tables=[self.table], checkfirst=True)
+
+    def _decode_row(self, row, channels: Sequence[str]) -> Dict[str, np.ndarray]:
+        n = row.sample_count
+        out = {"timestamp": decode_timestamps(row.timestamps_us) / 1e6}
+        for ch in channels:
+            blob = getattr(row, ch)
+            out[ch] = decode_channel(blob, n) if blob is not None else np.full(n, np.nan)
+        return out
+
+    def append(self, turbine_id: int, timestamps, **channels) -> int:
+        """
+        Merges samples into their buckets (read-modify-write per touched bucket).
+        For a timestamp already present in the bucket, the channels passed here
+        replace the stored values and the other channels keep theirs.
+
+        :param timestamps: Epoch seconds array
+        :param channels: Any of CHANNELS as arrays aligned with timestamps (missing -> NaN for new timestamps)
+        :return: Number of buckets written
+        """
+        with self.bind.begin() as conn:
+            return self._append(conn, turbine_id, timestamps, channels)
+
+    def _append(self, conn, turbine_id: int, timestamps, channels: Dict[str, np.ndarray]) -> int:
+        """append() on an open connection/transaction."""
+        ts_us = np.round(np.asarray(timestamps, dtype=float) * 1e6).astype(np.int64)
+        n = len(ts_us)
+        cols = {ch: np.asarray(channels[ch], dtype=float) if ch in channels else np.full(n, np.nan) for ch in CHANNELS}
+        bucket_us = self.bucket_seconds * 1_000_000
+        buckets = (ts_us // bucket_us) * self.bucket_seconds
+
+        written = 0
+        for bucket in np.unique(buckets):
+            sel = buckets == bucket
+            b_ts = ts_us[sel]
+            b_cols = {ch: col[sel] for ch, col in cols.items()}
+
+            key = and_(self.table.c.turbine_id == turbine_id, self.table.c.bucket_start == int(bucket))
+            existing = conn.execute(select(self.table).where(key)).first()
+            if existing is not None:
+                old = self._decode_row(existing, CHANNELS)
+                b_ts = np.concatenate([np.round(old["timestamp"] * 1e6).astype(np.int64), b_ts])
+                b_cols = {ch: np.concatenate([old[ch], b_cols[ch]]) for ch in CHANNELS}
+                conn.execute(self.table.delete().where(key))
+
+            # Stable sort keeps stored samples ahead of new ones per timestamp: passed
+            # channels take the last occurrence (newest write wins), the others the first
+            order = np.argsort(b_ts, kind="stable")
+            b_ts = b_ts[order]
+            new_group = b_ts[1:] != b_ts[:-1]
+            last = np.append(new_group, True)
+            first = np.insert(new_group, 0, True)
+
+            conn.execute(self.table.insert(), {
+                "turbine_id": int(turbine_id),
+                "bucket_start": int(bucket),
+                "sample_count": int(last.sum()),
+                "timestamps_us": encode_timestamps(b_ts[last]),
+                **{ch: encode_channel(b_cols[ch][order][last if ch in channels else first]) for ch in CHANNELS},
+            })
+            written += 1
+        return written
+
+    def query(self, turbine_id: int, start, end, channels: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Returns {"timestamp": epoch seconds, <channel>: values} for start <= t < end.
+        """
+        channels = list(channels) if channels is not None else list(CHANNELS)
+        unknown = set(channels) - set(CHANNELS)
+        if unknown:
+            raise ValueError(f"Unknown channels: {sorted(unknown)}")
+        t0, t1 = to_epoch_seconds(start), to_epoch_seconds(end)
+        first_bucket = int(t0 // self.bucket_seconds) * self.bucket_seconds
+
+        t = self.table
+        cols = [t.c.sample_count, t.c.timestamps_us] + [t.c[ch] for ch in channels]
+        stmt = (
+            select(*cols)
+            .where(t.c.turbine_id == turbine_id, t.c.bucket_start >= first_bucket, t.c.bucket_start < t1)
+            .order_by(t.c.bucket_start)
+        )
+        parts = {"timestamp": []}
+        parts.update({ch: [] for ch in channels})
+        with self.bind.connect() as conn:
+            for row in conn.execute(stmt):
+                decoded = self._decode_row(row, channels)
+                mask = (decoded["timestamp"] >= t0) & (decoded["timestamp"] < t1)
+                for name, arr in decoded.items():
+                    parts[name].append(arr[mask])
+        return {name: np.concatenate(arrs) if arrs else np.empty(0) for name, arrs in parts.items()}
+
+    def compact_from_rows(self, turbine_id: Optional[int] = None, batch_size: int = 100000) -> int:
+        """
+        Copies realtime_sensor_logs into chunks, streaming in batches ordered by
+        (turbine_id, timestamp). Rows without a turbine id or timestamp are
+        skipped. Returns the number of samples copied.
+
+        Reads and chunk writes share one connection and transaction, so a
+        non-WAL SQLite database is not locked against itself.
+        """
+        s = SensorLog.__table__
+        stmt = (
+            select(s.c.turbine_id, s.c.timestamp, *[s.c[ch] for ch in CHANNELS])
+            .where(s.c.turbine_id.isnot(None), s.c.timestamp.isnot(None))
+            .order_by(s.c.turbine_id, s.c.timestamp)
+        )
+        if turbine_id is not None:
+            stmt = stmt.where(s.c.turbine_id == turbine_id)
+
+        copied = 0
+        with self.bind.begin() as conn:
+            result = conn.execution_options(stream_results=True).execute(stmt)
+            while True:
+                rows = result.fetchmany(batch_size)
+                if not rows:
+                    break
+                ids = np.array([r[0] for r in rows])
+                ts = np.array([r[1].replace(tzinfo=timezone.utc).timestamp() for r in rows])
+                values = {ch: np.array([r[2 + i] for r in rows], dtype=float) for i, ch in enumerate(CHANNELS)}
+                for tid in np.unique(ids):
+                    sel = ids == tid
+                    self._append(conn, int(tid), ts[sel], {ch: v[sel] for ch, v in values.items()})
+                copied += len(rows)
+        return copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar telemetry chunk store")
+    parser.add_argument("--db", default=DATABASE_URL)
+    parser.add_argument("--turbine", type=int, help="Turbine id")
+    parser.add_argument("--compact", action="store_true", help="Build chunks from realtime_sensor_logs")
+    parser.add_argument("--start", help="Range start (ISO-8601 or epoch seconds)")
+    parser.add_argument("--end", help="Range end (ISO-8601 or epoch seconds)")
+    args = parser.parse_args()
+
+    store = ChunkStore(tune_sqlite(create_engine(args.db)))
+    if args.compact:
+        copied = store.compact_from_rows(args.turbine)
+        print(f"✅ Compacted {copied} samples into sensor_chunks")
+        return
+    if args.turbine is None or not args.start or not args.end:
+        parser.error("--turbine, --start and --end are required for a range query")
+
+    data = store.query(args.turbine, args.start, args.end)
+    print(f"🔹 {len(data['timestamp'])} samples for turbine {args.turbine}")
+    for ch in CHANNELS:
+        col = data[ch]
+        if len(col) and not np.all(np.isnan(col)):
+            print(f"   {ch:<18} min={np.nanmin(col):.3f} mean={np.nanmean(col):.3f} max={np.nanmax(col):.3f}")
+
+
+if __name__ == "__main__":
+    main()
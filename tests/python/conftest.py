@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The Python tools live as flat scripts in scripts/ and import each other by module name
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
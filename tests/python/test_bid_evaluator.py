@@ -0,0 +1,28 @@
+import math
+
+import pytest
+from bid_evaluator import STATUS_CODES, BidEvaluator
+
+GOOD = {
+    "manufacturer": "HydroTech Austria",
+    "turbine_type": "francis",
+    "offered_efficiency": 94.5,
+    "price_eur": 1500000,
+}
+SITE = {"net_head_m": 120.0, "design_flow_cms": 10.0}
+
+
+@pytest.mark.parametrize("efficiency", [None, math.nan])
+def test_missing_efficiency_is_rejected(efficiency):
+    missing = dict(GOOD, manufacturer="No Data Ltd", offered_efficiency=efficiency)
+    offers = [GOOD, missing]
+    with pytest.raises(ValueError, match=r"offered_efficiency.*\[1\]"):
+        BidEvaluator(120.0, 10.0).evaluate_offers(offers)
+    with pytest.raises(ValueError):
+        BidEvaluator.evaluate_portfolio([SITE], offers)
+
+
+def test_optional_columns_still_skip_checks():
+    offers = [dict(GOOD, rated_speed_rpm=None)]
+    result = BidEvaluator(120.0, 10.0).evaluate_offers(offers)
+    assert STATUS_CODES[result["status"][0]] == "SHORTLIST"
@@ -0,0 +1,12 @@
+from extract_cache import ExtractCache
+
+
+def test_prune_only_touches_scanned_roots(tmp_path):
+    with ExtractCache(str(tmp_path / "cache.sqlite"), "extractor", "1") as cache:
+        stored = ("docs/a.html", "docs/gone.html", "public/b.html", "../docs/a.html")
+        for path in stored:
+            cache.put(path, "digest", [])
+        # Narrower run over docs/ only, with docs/gone.html deleted since last time
+        assert cache.prune(["docs/a.html"], ["docs"]) == 1
+        remaining = {p for (p,) in cache.conn.execute("SELECT path FROM extract_cache")}
+    assert remaining == {"docs/a.html", "public/b.html", "../docs/a.html"}
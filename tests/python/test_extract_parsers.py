@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import extract_component_encyclopedia as encyclopedia
+import extract_knowledge as knowledge
+import pytest
+from extract_cache import DEFAULT_PARSER, parser_available, verify_parser
+
+KNOWLEDGE_HTML = """<html><body>
+<h2>Troubleshooting</h2>
+<p>Symptom: Bearing temperature rising</p>
+<p>Diagnosis: Grease degraded</p>
+<p>Recommended action: Regrease and monitor</p>
+<p>Severity: high</p>
+</body></html>
+"""
+
+ENCYCLOPEDIA_HTML = """<html><body>
+<h2>Runner Function</h2>
+<p>Converts the pressure energy of the water into torque.</p>
+<p>Blades are shaped for the design head.</p>
+<h2>History</h2>
+<p>Not part of the section.</p>
+<p>Definition: Guide vanes regulate the flow onto the runner.</p>
+</body></html>
+"""
+
+
+def read_knowledge(path):
+    return knowledge.decode_html(path.read_bytes())
+
+
+def read_encyclopedia(path):
+    return encyclopedia.read_html(path)[0]
+
+
+def extract_encyclopedia(markup, path, parser):
+    return encyclopedia.extract_from_markup(markup, parser)
+
+
+@pytest.fixture
+def pages(tmp_path):
+    paths = {}
+    for name, html in (
+        ("knowledge", KNOWLEDGE_HTML),
+        ("encyclopedia", ENCYCLOPEDIA_HTML),
+    ):
+        paths[name] = tmp_path / f"{name}.html"
+        paths[name].write_text(html, encoding="utf-8")
+    return paths
+
+
+def test_knowledge_golden(pages):
+    path = pages["knowledge"]
+    key = "BEARING_TEMPERATURE_RISING"
+    # Line window first, then the bare paragraph heuristic
+    # (duplicates are dropped later by extract_knowledge.main)
+    assert knowledge.extract_from_html(path, DEFAULT_PARSER) == [
+        {
+            "symptom_key": key,
+            "diagnosis": "Grease degraded",
+            "recommended_action": "Regrease and monitor",
+            "severity": "HIGH",
+            "source_file": str(path),
+        },
+        {
+            "symptom_key": key,
+            "diagnosis": "",
+            "recommended_action": "",
+            "severity": "MEDIUM",
+            "source_file": str(path),
+        },
+    ]
+
+
+def test_encyclopedia_golden(pages):
+    runner = (
+        "Converts the pressure energy of the water into torque.\n\n"
+        "Blades are shaped for the design head."
+    )
+    path = pages["encyclopedia"]
+    assert encyclopedia.extract_from_html(path, DEFAULT_PARSER) == [
+        ("Runner Function", runner),
+        ("Definition", "Guide vanes regulate the flow onto the runner."),
+    ]
+
+
+@pytest.mark.parametrize("candidate", ["lxml", "html5lib"])
+def test_optional_parsers_match_reference(pages, candidate):
+    if not parser_available(candidate):
+        pytest.skip(f"{candidate} is not installed")
+    result = verify_parser(
+        [pages["knowledge"]],
+        candidate,
+        read_knowledge,
+        knowledge.extract_from_markup,
+    )
+    assert result["differing"] == []
+    result = verify_parser(
+        [str(pages["encyclopedia"])],
+        candidate,
+        read_encyclopedia,
+        extract_encyclopedia,
+    )
+    assert result["files"] == 1 and result["differing"] == []
+
+
+def test_verify_parser_reports_differences(tmp_path):
+    path = Path(tmp_path / "page.html")
+    path.write_text("<p>x</p>", encoding="utf-8")
+
+    def extract(markup, f, parser):
+        return parser
+
+    result = verify_parser([path], "lxml", Path.read_text, extract)
+    assert result["files"] == 1 and result["differing"] == [str(path)]
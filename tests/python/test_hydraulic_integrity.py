@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+from hydraulic_integrity import (
+    DEFAULT_REGISTRY,
+    SERVO_PRESSURE_SENSOR,
+    HydraulicSafetyVerify,
+    IncidentSignatureRegistry,
+    PressureGradientDetector,
+)
+
+
+def test_nan_gradient_is_normal():
+    result = HydraulicSafetyVerify.check_hydraulic_integrity(12.0, 12.0, math.nan)
+    assert result == {"status": "NORMAL", "warnings": [], "action": "NONE"}
+
+
+def test_nan_gradient_batch_matches_nothing():
+    batch = HydraulicSafetyVerify.check_hydraulic_integrity_batch(
+        12.0, [12.0, 16.0, 12.0], [math.nan, math.nan, 65.0]
+    )
+    assert batch["status"].tolist() == [0, 1, 2]
+    assert "LEGACY PATTERN" not in " ".join(batch["warnings"][1])
+
+
+def test_match_counts_follow_strict_greater_than():
+    gradients = [math.nan, 49.9, 50.0, 50.1, math.inf, -math.inf]
+    counts = DEFAULT_REGISTRY.match_counts(SERVO_PRESSURE_SENSOR, gradients)
+    assert counts.tolist() == [0, 0, 0, 1, 1, 0]
+    assert DEFAULT_REGISTRY.match(SERVO_PRESSURE_SENSOR, math.nan) == []
+
+
+def test_empty_registry_matches_nothing():
+    empty = IncidentSignatureRegistry()
+    result = HydraulicSafetyVerify.check_hydraulic_integrity(
+        12.0, 12.0, 65.0, registry=empty
+    )
+    assert result == {"status": "NORMAL", "warnings": [], "action": "NONE"}
+
+    detector = PressureGradientDetector(1000.0, registry=empty)
+    assert detector.registry is empty
+    ramp = np.arange(2000) * 0.5  # 500 bar/s, far past LEG-HYD-001
+    assert detector.process(ramp) == []
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from telemetry_ingest import parse_timestamp
+from telemetry_store import to_epoch_seconds
+
+UTC_10H = datetime(2024, 1, 1, 10)
+PLUS_2H = timezone(timedelta(hours=2))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        datetime(2024, 1, 1, 12, tzinfo=PLUS_2H),
+        "2024-01-01T12:00:00+02:00",
+        "2024-01-01T10:00:00Z",
+        UTC_10H,
+        1704103200,
+    ],
+)
+def test_timestamps_normalize_to_naive_utc(value):
+    assert parse_timestamp(value) == UTC_10H
+    assert to_epoch_seconds(value) == 1704103200.0
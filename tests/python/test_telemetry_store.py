@@ -0,0 +1,29 @@
+import numpy as np
+from sqlalchemy import create_engine
+from telemetry_store import ChunkStore
+
+T0 = 1_704_067_200.0  # 2024-01-01T00:00:00Z
+
+
+def test_partial_append_keeps_other_channels(tmp_path):
+    store = ChunkStore(create_engine(f"sqlite:///{tmp_path / 'chunks.db'}"))
+    ts = T0 + np.arange(3)
+    store.append(7, ts, vibration_x_mm_s=[1.0, 2.0, 3.0], bearing_temp_c=[40, 41, 42])
+    # Overwrite one channel at t1..t2 and add a new sample at t3
+    store.append(7, T0 + np.arange(1, 4), vibration_x_mm_s=[20.0, 30.0, 40.0])
+
+    data = store.query(7, T0, T0 + 10)
+    assert data["timestamp"].tolist() == (T0 + np.arange(4)).tolist()
+    assert data["vibration_x_mm_s"].tolist() == [1.0, 20.0, 30.0, 40.0]
+    assert data["bearing_temp_c"][:3].tolist() == [40.0, 41.0, 42.0]
+    assert np.isnan(data["bearing_temp_c"][3])
+
+
+def test_full_append_replaces_sample(tmp_path):
+    store = ChunkStore(create_engine(f"sqlite:///{tmp_path / 'chunks.db'}"))
+    store.append(7, [T0], vibration_x_mm_s=[1.0], bearing_temp_c=[40.0])
+    store.append(7, [T0, T0], vibration_x_mm_s=[2.0, 3.0], bearing_temp_c=[50.0, 60.0])
+
+    data = store.query(7, T0, T0 + 1)
+    assert data["vibration_x_mm_s"].tolist() == [3.0]
+    assert data["bearing_temp_c"].tolist() == [60.0]